@@ -5,8 +5,7 @@ import struct
 
 
 def backwards(sound):
-    samplesList = sound["samples"].copy()
-    samplesList.reverse()
+    samplesList = sound["samples"][::-1]
     rateInt = sound["rate"]
     reversedSound = {"rate": rateInt, "samples": samplesList}
     return reversedSound
@@ -15,64 +14,24 @@ def backwards(sound):
 def mix(sound1, sound2, p):
 
     # mix 2 good sounds
-    if (
-        "rate" in sound1.keys()
-        and "rate" in sound2.keys()
-        and sound1["rate"] == sound2["rate"]
-    ) == False:
-
+    rate = sound1.get("rate")  # get rate
+    if rate is None or rate != sound2.get("rate"):
         print("no")
         return
 
-    try:
-        r = sound1["rate"]  # get rate
-        sound1 = sound1["samples"]
-        sound2 = sound2["samples"]
-        if len(sound1) < len(sound2):
-            l = len(sound1)
-        elif len(sound2) < len(sound1):
-            l = len(sound2)
-        elif len(sound1) == len(sound2):
-            l = len(sound1)
-        else:
-            print("whoops")
-            return
-
-        s = []
-        x = 0
-        while x <= l:
-            s2, s1 = p * sound1[x], sound2[x] * (1 - p)
-            s.append(s1 + s2)  # add sounds
-            x += 1
-            if x == l:  # end
-                break
-
-        return {"rate": r, "samples": s}  # return new sound
-
-    except KeyError:
-        rate = sound1["rate"]  # get rate
-        sound_left_1 = sound1["left"]
-        sound_right_1 = sound1["right"]
-        sound_left_2 = sound2["left"]
-        sound_right_2 = sound2["right"]
-
-        if len(sound_left_1) > len(sound_left_2):
-            length = len(sound_left_2)
-        else:
-            length = len(sound_left_1)
+    q = 1 - p
 
-        i = 0
-        s_left = []
-        s_right = []
+    # zip stops at the end of the shorter sound
+    if "samples" in sound1 and "samples" in sound2:
+        samples = [
+            p * s1 + q * s2 for s1, s2 in zip(sound1["samples"], sound2["samples"])
+        ]
+        return {"rate": rate, "samples": samples}  # return new sound
 
-        while i <= length - 1:
-            s_left2, s_left1 = p * sound_left_1[i], (1 - p) * sound_left_2[i]
-            s_right2, s_right1 = p * sound_right_1[i], (1 - p) * sound_right_2[i]
-            s_left.append(s_left1 + s_left2)  # add sounds
-            s_right.append(s_right1 + s_right2)
-            i += 1
+    s_left = [p * s1 + q * s2 for s1, s2 in zip(sound1["left"], sound2["left"])]
+    s_right = [p * s1 + q * s2 for s1, s2 in zip(sound1["right"], sound2["right"])]
 
-        return {"rate": rate, "left": s_left, "right": s_right}  # return new sound
+    return {"rate": rate, "left": s_left, "right": s_right}  # return new sound
 
 
 def convolve(sound, kernel):
@@ -94,10 +53,22 @@ def convolve(sound, kernel):
 
     final_sample = [0] * (len(samples) + len(kernel) - 1)
 
-    for i, number in enumerate(kernel):
+    # convolution is symmetric, so loop over whichever sequence needs less
+    # work: one slice pass per nonzero entry, each as long as the other one
+    outer, inner = kernel, samples
+    kernel_cost = sum(1 for number in kernel if number != 0) * len(samples)
+    sample_cost = sum(1 for sample in samples if sample != 0) * len(kernel)
+    if sample_cost < kernel_cost:
+        outer, inner = samples, kernel
+    num_inner = len(inner)
+
+    for i, number in enumerate(outer):
         if number != 0:
-            for x, sample in enumerate(samples):
-                final_sample[i + x] += sample * number
+            # add the whole shifted, scaled copy of inner in one slice pass
+            final_sample[i : i + num_inner] = [
+                total + value * number
+                for total, value in zip(final_sample[i : i + num_inner], inner)
+            ]
 
     return {"rate": sound["rate"], "samples": final_sample}
 
@@ -121,50 +92,34 @@ def echo(sound, num_echoes, delay, scale):
 
     delay_n = round(delay * rate)
     total_length = num_echoes * delay_n
-    echo_filter = [1]
+    echo_filter = [0] * (total_length + 1)
+    echo_filter[0] = 1
 
-    for x in range(num_echoes):
-        if x == 0:
-            echo_filter += [0] * (total_length)
-        offset = delay_n * (x + 1)
-        print(offset, len(echo_filter))
-        echo_filter[offset] = scale ** (x + 1)
+    for x in range(1, num_echoes + 1):
+        echo_filter[delay_n * x] = scale**x
 
     return convolve(sound, echo_filter)
 
 
 def pan(sound):
-    left_channel = sound["left"].copy()
-    scaled_left_sample = []
-
-    right_channel = sound["right"].copy()
-    scaled_right_sample = []
-
-    for i, sample in enumerate(left_channel):
-        if i == 0:
-            scaled_left_sample.append(sample * 1)
-            scaled_right_sample.append(right_channel[i] * 0)
-        elif i == len(left_channel):
-            scaled_left_sample.append(sample * 0)
-            scaled_left_sample.append(right_channel[i] * 1)
-        else:
-            scaled_left_sample.append(sample * (1 - (i / (len(left_channel) - 1))))
-            scaled_right_sample.append(right_channel[i] * (i / (len(left_channel) - 1)))
+    left_channel = sound["left"]
+    right_channel = sound["right"]
+
+    # fraction of the way through the sound: 0 at the first sample, 1 at the last
+    denominator = max(len(left_channel) - 1, 1)
+    ramp = [i / denominator for i in range(len(left_channel))]
 
     return {
         "rate": sound["rate"],
-        "left": scaled_left_sample,
-        "right": scaled_right_sample,
+        "left": [sample * (1 - frac) for sample, frac in zip(left_channel, ramp)],
+        "right": [sample * frac for sample, frac in zip(right_channel, ramp)],
     }
 
 
 def remove_vocals(sound):
-    left_sample = sound["left"].copy()
-    right_sample = sound["right"].copy()
-    difference_sample = []
-
-    for i, sample in enumerate(left_sample):
-        difference_sample.append(sample - right_sample[i])
+    difference_sample = [
+        left - right for left, right in zip(sound["left"], sound["right"])
+    ]
 
     return {"rate": sound["rate"], "samples": difference_sample}
 
@@ -173,6 +128,13 @@ def remove_vocals(sound):
 # and our internal dictionary representation for sounds
 
 
+# bass_boost_kernel results keyed on (boost, scale), stored as tuples so the
+# cached kernels can't be modified by callers; holds at most
+# _BASS_BOOST_CACHE_SIZE kernels, dropping the oldest one to make room
+_BASS_BOOST_CACHE_SIZE = 32
+_bass_boost_cache = {}
+
+
 def bass_boost_kernel(boost, scale=0):
     """
     Constructs a kernel that acts as a bass-boost filter.
@@ -192,12 +154,18 @@ def bass_boost_kernel(boost, scale=0):
     Returns:
         A list of floats representing a bass boost kernel.
     """
-    # make this a fake "sound" so that we can use the convolve function
-    base = {"rate": 0, "samples": [0.25, 0.5, 0.25]}
-    kernel = {"rate": 0, "samples": [0.25, 0.5, 0.25]}
-    for i in range(boost):
-        kernel = convolve(kernel, base["samples"])
-    kernel = kernel["samples"]
+    if (boost, scale) in _bass_boost_cache:
+        return list(_bass_boost_cache[(boost, scale)])
+
+    # convolving [0.25, 0.5, 0.25] with itself boost times gives the binomial
+    # taps C(2N, k) / 4^N with N = boost + 1, so build them directly
+    n = 2 * (boost + 1)
+    denominator = 4 ** (boost + 1)
+    coefficient = 1
+    kernel = []
+    for k in range(n + 1):
+        kernel.append(coefficient / denominator)
+        coefficient = coefficient * (n - k) // (k + 1)
 
     # at this point, the kernel will be acting as a low-pass filter, so we
     # scale up the values by the given scale, and add in a value in the middle
@@ -205,6 +173,10 @@ def bass_boost_kernel(boost, scale=0):
     kernel = [i * scale for i in kernel]
     kernel[len(kernel) // 2] += 1
 
+    if len(_bass_boost_cache) >= _BASS_BOOST_CACHE_SIZE:
+        # dicts keep insertion order, so the first key is the oldest
+        del _bass_boost_cache[next(iter(_bass_boost_cache))]
+    _bass_boost_cache[(boost, scale)] = tuple(kernel)
     return kernel
 
 
@@ -227,24 +199,25 @@ def load_wav(filename, stereo=False):
 
     out = {"rate": sr}
 
-    left = []
-    right = []
-    for i in range(count):
-        frame = sound_file.readframes(1)
-        if chan == 2:
-            left.append(struct.unpack("<h", frame[:2])[0])
-            right.append(struct.unpack("<h", frame[2:])[0])
-        else:
-            datum = struct.unpack("<h", frame)[0]
-            left.append(datum)
-            right.append(datum)
+    # read every frame at once and unpack the whole block in a single pass
+    raw = sound_file.readframes(count)
+    data = [datum for (datum,) in struct.iter_unpack("<h", raw)]
+    sound_file.close()
+
+    # scale the interleaved frames in one sweep, then split out the channels
+    scaled = [datum / (2**15) for datum in data]
 
-    if stereo:
-        out["left"] = [i / (2**15) for i in left]
-        out["right"] = [i / (2**15) for i in right]
+    if chan != 2:
+        if stereo:
+            out["left"] = scaled
+            out["right"] = scaled.copy()
+        else:
+            out["samples"] = scaled
+    elif stereo:
+        out["left"] = scaled[0::2]
+        out["right"] = scaled[1::2]
     else:
-        samples = [(ls + rs) / 2 for ls, rs in zip(left, right)]
-        out["samples"] = [i / (2**15) for i in samples]
+        out["samples"] = [(ls + rs) / 2 for ls, rs in zip(scaled[0::2], scaled[1::2])]
 
     return out
 
@@ -263,18 +236,19 @@ def write_wav(sound, filename):
     if "samples" in sound:
         # mono file
         outfile.setparams((1, 2, sound["rate"], 0, "NONE", "not compressed"))
-        out = [int(max(-1, min(1, v)) * (2**15 - 1)) for v in sound["samples"]]
+        samples = sound["samples"]
     else:
         # stereo
         outfile.setparams((2, 2, sound["rate"], 0, "NONE", "not compressed"))
-        out = []
-        for l_val, r_val in zip(sound["left"], sound["right"]):
-            l_val = int(max(-1, min(1, l_val)) * (2**15 - 1))
-            r_val = int(max(-1, min(1, r_val)) * (2**15 - 1))
-            out.append(l_val)
-            out.append(r_val)
-
-    outfile.writeframes(b"".join(struct.pack("<h", frame) for frame in out))
+        length = min(len(sound["left"]), len(sound["right"]))
+        # interleave the channels with slice assignment
+        samples = [0] * (2 * length)
+        samples[0::2] = sound["left"][:length]
+        samples[1::2] = sound["right"][:length]
+
+    # clip and convert both channels in a single sweep over the frames
+    out = [int(max(-1, min(1, v)) * (2**15 - 1)) for v in samples]
+    outfile.writeframes(struct.pack(f"<{len(out)}h", *out))
     outfile.close()
 
 
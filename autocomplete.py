@@ -1,8 +1,12 @@
 import doctest
+import heapq
 from text_tokenize import tokenize_sentences
 
 
 class PrefixTree:
+    # one instance per letter of every stored word, so skip the per-node __dict__
+    __slots__ = ("value", "children")
+
     def __init__(self):
         self.value = None
         self.children = {}
@@ -15,11 +19,13 @@ class PrefixTree:
         """
         if not isinstance(key, str):
             raise TypeError
+        node = self
         for letter in key:
-            if letter not in self.children:
-                self.children[letter] = PrefixTree()
-            self = self.children[letter]
-        self.value = value
+            child = node.children.get(letter)
+            if child is None:
+                child = node.children[letter] = PrefixTree()
+            node = child
+        node.value = value
 
     def __getitem__(self, key):
         """
@@ -30,11 +36,10 @@ class PrefixTree:
         if not isinstance(key, str):
             raise TypeError
 
-        if len(key) == 1:
-            if key not in self.children or self.children[key] is None:
-                raise KeyError
-            return self.children[key].value
-        return self.children[key[0]].__getitem__(key[1:])
+        node = self.__getsubtree__(key)
+        if node is None or node.value is None:
+            raise KeyError
+        return node.value
 
     def __delitem__(self, key):
         """
@@ -57,15 +62,8 @@ class PrefixTree:
         if not isinstance(key, str):
             raise TypeError
 
-        if not key:  # len(key) == 0:
-            if self.value is not None:
-                return True
-        # elif len(key) == 1:
-        #     if key in self.children and self.children[key].value is not None:
-        #         return True
-        elif key[0] in self.children:
-            return self.children[key[0]].__contains__(key[1:])
-        return False
+        node = self.__getsubtree__(key)
+        return node is not None and node.value is not None
 
     def __iter__(self, curr_key=""):
         """
@@ -84,10 +82,12 @@ class PrefixTree:
         if not isinstance(key, str):
             return []
 
-        if not key:  # len(key) == 0:
-            return self
-        elif key[0] in self.children:
-            return self.children[key[0]].__getsubtree__(key[1:])
+        node = self
+        for letter in key:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
 
 
 def word_frequencies(text):
@@ -130,13 +130,10 @@ def autocomplete(tree, prefix, max_count=None):
     if not max_count:  # return all words with prefix in list
         return [prefix + pair[0] for pair in pair_subtree]
 
-    list_pair_subtree = list(pair_subtree)  # turn generator into a list
-    list_pair_subtree.sort(key=lambda x: x[1], reverse=True)  # reverse sort it
+    # only keep the max_count most frequent pairs instead of sorting them all
+    top_pairs = heapq.nlargest(max_count, pair_subtree, key=lambda x: x[1])
 
-    return [prefix + pair[0] for pair in list_pair_subtree[:max_count]]
-    # return_list = []
-    # for pair in list_pair_subtree[:max_count]:
-    #     return_list.append(prefix + pair[0])
+    return [prefix + pair[0] for pair in top_pairs]
 
 
 def autocorrect(tree, prefix, max_count=None):
@@ -165,10 +162,7 @@ def autocorrect(tree, prefix, max_count=None):
 
     # if autocomplete result is shorter than max_count but max_count is
     # less than all possible corrections
-    pair_autocorrect_list = []
-    for word in autocorrect_set:
-        pair_autocorrect_list.append((word, tree.__getitem__(word)))
-
+    pair_autocorrect_list = list(autocorrect_set.items())
     pair_autocorrect_list.sort(key=lambda x: x[1], reverse=True)
     return [
         pair[0] for pair in pair_autocorrect_list[: max_count - len(autocomplete_set)]
@@ -182,41 +176,48 @@ def all_results(tree, prefix, max_count):
 
     autocomplete_set = result of calling autocomplete function,
                         turned into a set
-    autocorrect_set = all the edits made
+    autocorrect_set = dict mapping all the edits made to their frequencies
     """
     autocomplete_set = set(autocomplete(tree, prefix, max_count))
-    autocorrect_set = set()
+    autocorrect_set = {}
+
+    def add_edit(node, head, rest):
+        # node is reached by head; finish walking the edited word head + rest
+        for letter in rest:
+            node = node.children.get(letter)
+            if node is None:
+                return
+        if node.value is not None:
+            word = head + rest
+            if word not in autocomplete_set:
+                autocorrect_set[word] = node.value
+
+    # nodes[i] is reached by prefix[:i], so every edit at position i resumes
+    # walking from there instead of from the root
+    nodes = [tree]
+    for letter in prefix[:-1]:
+        node = nodes[-1].children.get(letter)
+        if node is None:
+            break
+        nodes.append(node)
 
     alphabet = "abcdefghijklmnopqrstuvwxyz"
-    for i in range(len(prefix)):
+    last_transpose = len(prefix) - 2
+    for i, node in enumerate(nodes[: len(prefix)]):
+        head = prefix[:i]
         ##insertion
-        for letter in alphabet:
-            insertion_word = prefix[:i] + letter + prefix[i:]
-            if (
-                tree.__contains__(insertion_word)
-                and insertion_word not in autocomplete_set
-            ):
-                autocorrect_set.add(insertion_word)
+        for letter, child in node.children.items():
+            if letter in alphabet:
+                add_edit(child, head + letter, prefix[i:])
         ##deletion
-        deletion_word = prefix[:i] + prefix[i + 1 :]
-        if tree.__contains__(deletion_word) and deletion_word not in autocomplete_set:
-            autocorrect_set.add(deletion_word)
+        add_edit(node, head, prefix[i + 1 :])
         ##replacement
-        for letter in alphabet:
-            replacement_word = prefix[:i] + letter + prefix[i + 1 :]
-            if (
-                tree.__contains__(replacement_word)
-                and replacement_word not in autocomplete_set
-            ):
-                autocorrect_set.add(replacement_word)
+        for letter, child in node.children.items():
+            if letter in alphabet:
+                add_edit(child, head + letter, prefix[i + 1 :])
         ##transpose
-        if i < len(prefix[:-2]):
-            transpose_word = prefix[:i] + prefix[i + 1] + prefix[i] + prefix[i + 2 :]
-            if (
-                tree.__contains__(transpose_word)
-                and transpose_word not in autocomplete_set
-            ):
-                autocorrect_set.add(transpose_word)
+        if i < last_transpose:
+            add_edit(node, head, prefix[i + 1] + prefix[i] + prefix[i + 2 :])
 
     return autocomplete_set, autocorrect_set
 
@@ -229,12 +230,10 @@ def word_filter(tree, pattern):
          ? matches any single character,
          otherwise char in pattern char must equal char in word.
     """
-    return_set = set()
-
     def word_filter_helper(tree, pattern, prefix=""):
         if not pattern:
             if tree.value:
-                return_set.add((prefix, tree.value))
+                yield (prefix, tree.value)
         else:
             char = pattern[0]
             rest_char = pattern[1:]
@@ -242,20 +241,18 @@ def word_filter(tree, pattern):
             ##matches the next unmatched character in word no matter what it is
             if char == "?":
                 for letter, child in children.items():
-                    word_filter_helper(child, rest_char, prefix + letter)
+                    yield from word_filter_helper(child, rest_char, prefix + letter)
             ##sequence of zero or more of the next unmatched characters in word
             elif char == "*":
                 for letter, child in children.items():
-                    word_filter_helper(child, pattern, prefix + letter)
-                word_filter_helper(tree, rest_char, prefix)
+                    yield from word_filter_helper(child, pattern, prefix + letter)
+                yield from word_filter_helper(tree, rest_char, prefix)
             ##character in the pattern must exactly match the next unmatched character in the word
             elif char in children:
-                subtree = tree.__getsubtree__(char)
-                word_filter_helper(subtree, rest_char, prefix + char)
-
-    word_filter_helper(tree, pattern)
+                yield from word_filter_helper(children[char], rest_char, prefix + char)
 
-    return list(return_set)
+    # several "*"s can match the same word in different ways, so dedup once here
+    return list(set(word_filter_helper(tree, pattern)))
 
 
 # you can include test cases of your own in the block below.
@@ -1,17 +1,54 @@
 #!/usr/bin/env python3
 
 import pickle
+from collections import deque
+
+
+def _find(parent, actor):
+    """
+    returns the root of actor's tree in the union-find forest parent,
+    pointing every actor on the way directly at the root
+    """
+    root = actor
+    while parent[root] != root:
+        root = parent[root]
+    while parent[actor] != root:
+        parent[actor], actor = root, parent[actor]
+    return root
+
+
+def _union(parent, size, actor_id_1, actor_id_2):
+    """
+    merges the trees of the two actors, hanging the smaller one under the larger
+    """
+    for actor in (actor_id_1, actor_id_2):
+        if actor not in parent:
+            parent[actor] = actor
+            size[actor] = 1
+    root_1 = _find(parent, actor_id_1)
+    root_2 = _find(parent, actor_id_2)
+    if root_1 == root_2:
+        return
+    if size[root_1] < size[root_2]:
+        root_1, root_2 = root_2, root_1
+    parent[root_2] = root_1
+    size[root_1] += size[root_2]
 
 
 def transform_data(raw_data):
     """
     dict where key is film_id and value is a set of all actors in the film
     dict where key is actor and value is a set of all actors that have acted with them
+    dict where key is actor and value is a set of all films the actor was in
+    dict where key is actor and value is an id of the actor's connected component
 
     raw_data in the form of a list of tuples (actor_id_1, actor_id_2, film_id)
     """
     film_dict = {}
     actor_dict = {}
+    actor_to_films = {}
+    parent = {}
+    size = {}
     for tup in raw_data:
         # makes dict with key film_id & value all actors in film
         if tup[2] in film_dict:
@@ -28,7 +65,16 @@ def transform_data(raw_data):
             actor_dict[tup[1]].update({tup[0]})
         else:
             actor_dict[tup[1]] = {tup[0], tup[1]}
-    return film_dict, actor_dict
+
+        # makes dict with key actor & all films the actor was in
+        actor_to_films.setdefault(tup[0], set()).add(tup[2])
+        actor_to_films.setdefault(tup[1], set()).add(tup[2])
+
+        # actors who acted together are in the same connected component
+        _union(parent, size, tup[0], tup[1])
+
+    component = {actor: _find(parent, actor) for actor in parent}
+    return film_dict, actor_dict, actor_to_films, component
 
 
 def acted_together(transformed_data, actor_id_1, actor_id_2):
@@ -65,81 +111,51 @@ def bacon_path(transformed_data, actor_id):
 
 
 def actor_to_actor_path(transformed_data, actor_id_1, actor_id_2):
+    component = transformed_data[3]
+    # no path can leave a connected component, so skip the search entirely
+    if component.get(actor_id_1) != component.get(actor_id_2):
+        return None
     return actor_path(transformed_data, actor_id_1, lambda p: p == actor_id_2)
 
 
 def movie_path(transformed_data, actor_id_1, actor_id_2):
     act_path = actor_to_actor_path(transformed_data, actor_id_1, actor_id_2)
+    if act_path is None:
+        return None
+
+    actor_to_films = transformed_data[2]
     film_list = []
-    for i in range(len(act_path)):
-        for film in transformed_data[0].keys():
-            if i == len(act_path) - 1:
-                continue
-            if (
-                act_path[i] in transformed_data[0][film]
-                and act_path[i + 1] in transformed_data[0][film]
-            ):
-                film_list.append(film)
+    for actor, next_actor in zip(act_path, act_path[1:]):
+        # any film the two consecutive actors share connects them
+        shared_films = actor_to_films[actor] & actor_to_films[next_actor]
+        film_list.append(next(iter(shared_films)))
     return film_list
 
 
 def actor_path(transformed_data, actor_id_1, goal_test_function):
     if actor_id_1 not in transformed_data[1]:
         return None
-    
-    to_visit = {actor_id_1}
-    visited = {actor_id_1}
 
     if goal_test_function(actor_id_1):
         return [actor_id_1]
-    to_visit = [(actor_id_1, [actor_id_1])]
-    visited = {actor_id_1}
+    to_visit = deque([actor_id_1])
+    parent = {actor_id_1: None}  # also serves as the visited set
     while to_visit:
-        (actor, path) = to_visit.pop(0)
-        for coactor in transformed_data[1][actor] - visited:
-            if coactor in visited:
+        actor = to_visit.popleft()
+        for coactor in transformed_data[1][actor]:
+            if coactor in parent:
                 continue
-            visited.add(coactor)
+            parent[coactor] = actor
             if goal_test_function(coactor):
-                return path + [coactor]
-            to_visit.append((coactor, path + [coactor]))
+                # walk the parents back to the start only once, at the end
+                path = []
+                while coactor is not None:
+                    path.append(coactor)
+                    coactor = parent[coactor]
+                return path[::-1]
+            to_visit.append(coactor)
     return None
 
-    ### less efficient, but another way to do the same thing ###
-    # if actor_id_1 not in transformed_data[1]:
-    #     return None
-
-    # to_visit = {actor_id_1}
-    # visited = {actor_id_1}
-    # parent = {actor_id_1: None}
-
-    # current_actor = actor_id_1
-
-    # while not goal_test_function(current_actor):
-    #     n_set = set()
-    #     for actor in to_visit:
-    #         for child in transformed_data[1][actor]:
-    #             if child in visited:
-    #                 continue
-    #             n_set.add(child)
-    #             visited.add(child)
-    #             parent[child] = actor
-    #             current_actor = child
-    #             if goal_test_function(current_actor):
-    #                 break
-    #         if goal_test_function(current_actor):
-    #             break
-    #     if len(to_visit) == 0:
-    #         return None
-
-    #     to_visit = n_set
-    # result = []
-    # while current_actor != None:
-    #     result.append(current_actor)
-    #     current_actor = parent[current_actor]
-
-    # return result[::-1]
-
 
 def actors_connecting_films(transformed_data, film1, film2):
     actor_set1 = transformed_data[0][film1]
@@ -149,9 +165,7 @@ def actors_connecting_films(transformed_data, film1, film2):
 
     for actor1 in actor_set1:
         for actor2 in actor_set2:
-            path_list.append(
-                actor_path(transformed_data, actor1, lambda p: p == actor2)
-            )
+            path_list.append(actor_to_actor_path(transformed_data, actor1, actor2))
 
     return min(path_list, key=len)
 
@@ -162,13 +176,13 @@ if __name__ == "__main__":
 
     # with open("resources/names.pickle", "rb") as f:
     #     namesdb = pickle.load(f)
+    # # reverse index built once so every id -> name lookup is O(1)
+    # id_to_name = {actor_id: name for name, actor_id in namesdb.items()}
 
     # print(namesdb)
     # print(namesdb["Tom Hoover"])
     # print(namesdb)
-    # for key, val in namesdb.items():
-    #     if val == 35753:
-    #         print(key)
+    # print(id_to_name[35753])
 
     # with open("resources/tiny.pickle", "rb") as f:
     #     tinydb = pickle.load(f)
@@ -185,40 +199,26 @@ if __name__ == "__main__":
     #     largedb = pickle.load(f)
 
     # ids = actors_with_bacon_number(transform_data(largedb), 6)
-    # actor_set = set()
-    # for actors in ids:
-    #     for key, val in namesdb.items():
-    #         if val == actors:
-    #             actor_set.add(key)
+    # actor_set = {id_to_name[actor] for actor in ids}
     # print(actor_set)
 
     # print(bacon_path(transform_data(tinydb), 1640))
 
     # path = bacon_path(transform_data(largedb), namesdb["Isabelle Aring"])
-    # names = []
-    # for actor in path:
-    #     for key, val in namesdb.items():
-    #         if val == actor:
-    #             names.append(key)
+    # names = [id_to_name[actor] for actor in path]
     # print(names)
 
     # path = actor_to_actor_path(transform_data(largedb), namesdb["Fern Emmett"], namesdb["Willie Adams"])
-    # names = []
-    # for actor in path:
-    #     for key, val in namesdb.items():
-    #         if val == actor:
-    #             names.append(key)
+    # names = [id_to_name[actor] for actor in path]
     # print(names)
 
     with open("resources/movies.pickle", "rb") as f:
         moviesdb = pickle.load(f)
+    # # reverse index built once so every id -> title lookup is O(1)
+    # id_to_film = {film_id: title for title, film_id in moviesdb.items()}
 
     # path = movie_path(transform_data(largedb), namesdb["Emily Ann Lloyd"], namesdb["Anton Radacic"])
-    # movies = []
-    # for film in path:
-    #     for key, val in moviesdb.items():
-    #         if val == film:
-    #             movies.append(key)
+    # movies = [id_to_film[film] for film in path]
     # print(movies)
 
     pass
@@ -1,9 +1,47 @@
 #!/usr/bin/env python3
 
+import functools
 import math
+from collections import deque
+from itertools import accumulate, islice
 
 from PIL import Image
 
+def get_zero_pixel(pixels, num_row, num_col, row, col):
+    """
+    Return the pixel at (row, col), or 0 outside of the image.
+    """
+    if 0 <= row < num_row and 0 <= col < num_col:
+        return pixels[row * num_col + col]
+    return 0
+
+
+def get_extend_pixel(pixels, num_row, num_col, row, col):
+    """
+    Return the pixel at (row, col), or the nearest edge pixel outside of the image.
+    """
+    row = min(max(row, 0), num_row - 1)
+    col = min(max(col, 0), num_col - 1)
+    return pixels[row * num_col + col]
+
+
+def get_wrap_pixel(pixels, num_row, num_col, row, col):
+    """
+    Return the pixel at (row, col), wrapping around to the other edge outside
+    of the image.
+    """
+    return pixels[(row % num_row) * num_col + (col % num_col)]
+
+
+# one specialized pixel getter per boundary behavior, so callers can pick the
+# getter once instead of comparing boundary_behavior on every pixel
+BOUNDARY_GETTERS = {
+    "zero": get_zero_pixel,
+    "extend": get_extend_pixel,
+    "wrap": get_wrap_pixel,
+}
+
+
 def get_pixel(image, row, col, boundary_behavior):
     """
     Return the value (at the given row and column) of the current
@@ -16,32 +54,13 @@ def get_pixel(image, row, col, boundary_behavior):
     num_col = image["width"]
     pixel = image["pixels"]
 
-    if row < 0 or col < 0 or row >= num_row or col >= num_col:
-        if boundary_behavior == "zero":
-            return 0
-
-        elif boundary_behavior == "extend":
-            new_row = 0
-            new_col = 0
-            if row > num_row - 1:
-                new_row = num_row - 1
-            elif row < 0:
-                new_row = 0
-            else:
-                new_row = row
-            if col > num_col - 1:
-                new_col = num_col - 1
-            elif col < 0:
-                new_col = 0
-            else:
-                new_col = col
-            return pixel[int(new_row * num_col + new_col)]
-
-        elif boundary_behavior == "wrap":
-            return pixel[(row % num_row) * num_col + (col % num_col)]
-    else:
+    if 0 <= row < num_row and 0 <= col < num_col:
         return pixel[int(row * num_col + col)]
 
+    getter = BOUNDARY_GETTERS.get(boundary_behavior)
+    if getter is not None:
+        return getter(pixel, num_row, num_col, row, col)
+
 
 def set_pixel(image, row, col, color):
     """
@@ -59,17 +78,35 @@ def apply_per_pixel(image, func):
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
     """
-    result = {
+    pixels = image["pixels"]
+    # greyscale images repeat the same few values, so collect the distinct ones
+    present = set(pixels) if len(pixels) > 256 else ()
+
+    if len(present) > 256 or not all(
+        type(color) is int and 0 <= color <= 255 for color in present
+    ):
+        present = ()
+
+    if not present:
+        # pixels are stored row-major, so map over the whole flat list at once
+        new_pixels = [func(color) for color in pixels]
+    else:
+        # call func once per value the image holds and look every pixel up,
+        # translating the whole image in one C pass when the results are
+        # themselves valid greyscale values
+        results = {color: func(color) for color in present}
+        if all(type(new) is int and 0 <= new <= 255 for new in results.values()):
+            table = bytearray(256)
+            for color, new in results.items():
+                table[color] = new
+            new_pixels = list(bytes(pixels).translate(table))
+        else:
+            new_pixels = [results[color] for color in pixels]
+    return {
         "height": image["height"],
         "width": image["width"],
-        "pixels": image["pixels"].copy(),
+        "pixels": new_pixels,
     }
-    for row in range(image["height"]):
-        for col in range(image["width"]):
-            color = get_pixel(image, row, col, None)
-            new_color = func(color)
-            set_pixel(result, row, col, new_color)
-    return result
 
 
 def inverted(image):
@@ -82,6 +119,153 @@ def inverted(image):
 # HELPER FUNCTIONS
 
 
+def get_boundary_lut(size, pad, boundary_behavior):
+    """
+    Return, for every position from -pad to size + pad - 1 along an axis of
+    the given size, the in-bounds position whose pixel should be read there
+    under the "extend" or "wrap" boundary behavior.
+    """
+    if boundary_behavior == "extend":
+        return [min(max(index, 0), size - 1) for index in range(-pad, size + pad)]
+    return [index % size for index in range(-pad, size + pad)]
+
+
+def iter_padded_rows(image, pad, boundary_behavior):
+    """
+    Yield the rows of the given image one at a time as lists, with pad extra
+    pixels on every side filled in according to boundary_behavior.
+
+    Rows are produced lazily so that stencils only need to keep the few rows
+    under their kernel alive, rather than a padded copy of the whole image.
+    """
+    pixels = image["pixels"]
+    num_row = image["height"]
+    num_col = image["width"]
+
+    if boundary_behavior == "zero":
+        zeros = [0] * pad
+        for row in range(-pad, num_row + pad):
+            if 0 <= row < num_row:
+                yield zeros + pixels[row * num_col : (row + 1) * num_col] + zeros
+            else:
+                yield [0] * (num_col + 2 * pad)
+        return
+
+    # the boundary is resolved once per axis into index tables, so padding is
+    # a plain gather with no per-pixel bounds checks or modulos
+    col_lut = get_boundary_lut(num_col, pad, boundary_behavior)
+    for row in get_boundary_lut(num_row, pad, boundary_behavior):
+        row_pixels = pixels[row * num_col : (row + 1) * num_col]
+        yield [row_pixels[col] for col in col_lut]
+
+
+def box_sums(image, kernel_size, boundary_behavior):
+    """
+    Return a flat list holding, for every pixel, the sum of the kernel_size by
+    kernel_size box of pixels around it.
+
+    Uses a summed-area table, so the cost per pixel does not depend on
+    kernel_size.
+    """
+    num_row = image["height"]
+    num_col = image["width"]
+    pad = kernel_size // 2
+
+    # an empty axis has no edge pixels to extend or wrap around to
+    if not num_row or not num_col:
+        return []
+
+    def table_rows():
+        # row i of the table holds the sums of the first i padded rows up to
+        # each column, with a leading row and column of zeros so that boxes
+        # touching the top or left edge need no special case
+        previous = [0] * (num_col + 2 * pad + 1)
+        yield previous
+        for padded_row in iter_padded_rows(image, pad, boundary_behavior):
+            previous = [
+                above + left
+                for above, left in zip(previous, accumulate(padded_row, initial=0))
+            ]
+            yield previous
+
+    # each output row only needs the table rows at the top and bottom of its box
+    table = table_rows()
+    window = deque(islice(table, kernel_size), maxlen=kernel_size + 1)
+
+    sums = []
+    for row in range(num_row):
+        window.append(next(table))
+        # sums of each column over this row's band, then box sums from those
+        band = [bottom - top for bottom, top in zip(window[-1], window[0])]
+        sums.extend(
+            [right - left for right, left in zip(band[kernel_size:], band[:num_col])]
+        )
+    return sums
+
+
+# kernels with more nonzero entries than this are too long to unroll into a
+# single generated expression, and use the generic row loop instead
+MAX_UNROLLED_ENTRIES = 1000
+
+
+@functools.lru_cache(maxsize=64)
+def make_row_correlator(typed_kernel):
+    """
+    Return a function computing one output row of a correlation with the given
+    kernel, given the window of padded rows under the kernel and the output
+    width.  The kernel is a tuple of row tuples of (type, value) pairs: 1, 1.0
+    and True are equal cache keys, so the types keep an int kernel from reusing
+    the correlator of a float one.
+
+    The returned function is generated for this specific kernel: the loops
+    over kernel entries are unrolled into one expression per pixel, and zero
+    entries are left out of it entirely.
+    """
+    kernel = tuple(tuple(scale for _, scale in row) for row in typed_kernel)
+    entries = [
+        (y, x, scale)
+        for y, kernel_row in enumerate(kernel)
+        for x, scale in enumerate(kernel_row)
+        if scale != 0
+    ]
+
+    if not entries:
+        return lambda rows, width: [0] * width
+
+    if len(entries) > MAX_UNROLLED_ENTRIES:
+
+        def correlate_row(rows, width):
+            # accumulate a whole output row at a time, one kernel entry per pass
+            new_row = [0] * width
+            for kernel_row, padded_row in zip(kernel, rows):
+                for x, scale in enumerate(kernel_row):
+                    if scale != 0:
+                        new_row = [
+                            total + pixel * scale
+                            for total, pixel in zip(new_row, padded_row[x : x + width])
+                        ]
+            return new_row
+
+        return correlate_row
+
+    # entries are summed in the same row-major order as the generic loop, so
+    # both give exactly the same values
+    names = [f"p{y}_{x}" for y, x, _ in entries]
+    source = (
+        "def correlate_row(rows, width):\n"
+        f"    {', '.join(f'r{y}' for y in range(len(kernel)))}, = rows\n"
+        "    return [\n"
+        f"        {' + '.join(f'{name} * k{name}' for name in names)}\n"
+        f"        for {', '.join(names)}, in zip(\n"
+        f"            {', '.join(f'r{y}[{x} : {x} + width]' for y, x, _ in entries)}\n"
+        "        )\n"
+        "    ]\n"
+    )
+    namespace = {f"k{name}": scale for name, (_, _, scale) in zip(names, entries)}
+    exec(source, namespace)
+    return namespace["correlate_row"]
+
+
 def correlate(image, kernel, boundary_behavior):
     """
     Compute the result of correlating the given image with the given kernel.
@@ -104,34 +288,44 @@ def correlate(image, kernel, boundary_behavior):
     DESCRIBE YOUR KERNEL REPRESENTATION HERE
     The kernel is a 2D list, where there are lists inside a list. Each inner list represents
     one row of the kernel.
+
+    >>> correlate({"height": 0, "width": 0, "pixels": []}, [[1]], "extend")
+    {'height': 0, 'width': 0, 'pixels': []}
+    >>> correlate({"height": 0, "width": 3, "pixels": []}, [[1]], "wrap")
+    {'height': 0, 'width': 3, 'pixels': []}
+    >>> correlate({"height": 2, "width": 0, "pixels": []}, [[1]], "extend")
+    {'height': 2, 'width': 0, 'pixels': []}
     """
 
     num_row = image["height"]
     num_col = image["width"]
 
     kernel_length = len(kernel)
+    half = kernel_length // 2
 
-    new_image_pixel = []
-
-    if (
-        boundary_behavior != "zero"
-        and boundary_behavior != "extend"
-        and boundary_behavior != "wrap"
-    ):
+    if boundary_behavior not in BOUNDARY_GETTERS:
         return None
+
+    # an empty axis has no edge pixels to extend or wrap around to
+    if not num_row or not num_col:
+        return {"height": num_row, "width": num_col, "pixels": []}
+
+    # every slot is overwritten below, one output row per slice assignment
+    new_image_pixel = [0] * (num_row * num_col)
+
+    # resolve the boundary once by padding the image, so that every kernel
+    # entry below reads a plain slice of a padded row; only the kernel_length
+    # padded rows under the kernel are kept at a time
+    padded_rows = iter_padded_rows(image, half, boundary_behavior)
+    window = deque(islice(padded_rows, kernel_length - 1), maxlen=kernel_length)
+
+    correlate_row = make_row_correlator(
+        tuple(tuple((type(scale), scale) for scale in row) for row in kernel)
+    )
     for row in range(num_row):
-        for col in range(num_col):
-            new_pixel = 0
-            for y in range(kernel_length):
-                for x in range(kernel_length):
-                    new_col = col + x - kernel_length // 2
-                    new_row = row + y - kernel_length // 2
-                    val = (
-                        get_pixel(image, new_row, new_col, boundary_behavior)
-                        * kernel[y][x]
-                    )
-                    new_pixel += val
-            new_image_pixel.append(new_pixel)
+        window.append(next(padded_rows))
+        start = row * num_col
+        new_image_pixel[start : start + num_col] = correlate_row(window, num_col)
 
     return {"height": num_row, "width": num_col, "pixels": new_image_pixel}
 
@@ -149,16 +343,11 @@ def round_and_clip_image(image):
     """
     row = image["height"]
     column = image["width"]
-    pixel = image["pixels"].copy()
-    pixel = [int(round(x)) for x in pixel]
-    new_pixel = []
-    for value in pixel:
-        if value < 0:
-            new_pixel.append(0)
-        elif value > 255:
-            new_pixel.append(255)
-        else:
-            new_pixel.append(value)
+    # round and clip in a single pass over the pixels
+    new_pixel = [
+        0 if value < 0 else 255 if value > 255 else value
+        for value in map(round, image["pixels"])
+    ]
     return {"height": row, "width": column, "pixels": new_pixel}
 
 
@@ -172,6 +361,9 @@ def blurred(image, kernel_size):
 
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
+
+    >>> blurred({"height": 2, "width": 0, "pixels": []}, 3)
+    {'height': 2, 'width': 0, 'pixels': []}
     """
     # first, create a representation for the appropriate n-by-n kernel (you may
     # wish to define another helper function for this)
@@ -180,8 +372,33 @@ def blurred(image, kernel_size):
 
     # and, finally, make sure that the output is a valid image (using the
     # helper function from above) before returning it.
-    kernel = [[1 / (kernel_size**2)] * kernel_size] * kernel_size
-    correlation = correlate(image, kernel, "extend")
+    # every box average is its box sum over the kernel area
+    area = kernel_size**2
+    sums = box_sums(image, kernel_size, "extend")
+    pixels = image["pixels"]
+
+    if (
+        area % 2
+        and pixels
+        and set(map(type, pixels)) <= {int}
+        and 0 <= min(pixels)
+        and max(pixels) <= 255
+    ):
+        # the sums of valid integer pixels are exact integers, so round their
+        # averages with integer arithmetic (an odd area can't produce a .5 tie)
+        # and skip clipping: an average of values in [0, 255] stays in range
+        half_area = area // 2
+        return {
+            "height": image["height"],
+            "width": image["width"],
+            "pixels": [(total + half_area) // area for total in sums],
+        }
+
+    correlation = {
+        "height": image["height"],
+        "width": image["width"],
+        "pixels": [total / area for total in sums],
+    }
     return round_and_clip_image(correlation)
 
 
@@ -193,10 +410,10 @@ def sharpened(image, n):
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
     """
-    pixel = image["pixels"].copy()
     blurred_image = blurred(image, n)
     sharpened_image_pixels = [
-        (2 * pixel[i] - blurred_image["pixels"][i]) for i in range(len(image["pixels"]))
+        2 * pixel - blurred_pixel
+        for pixel, blurred_pixel in zip(image["pixels"], blurred_image["pixels"])
     ]
     return round_and_clip_image(
         {
@@ -214,32 +431,55 @@ def edges(image):
 
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
-    """
-    Krow = [[-1, -2, -1], [0, 0, 0], [1, 2, 1]]
-    Kcol = [[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]]
-
-    correlate_Krow = correlate(image.copy(), Krow, "extend")
-    correlate_Kcol = correlate(image.copy(), Kcol, "extend")
 
-    edge_list = [
-        round(
-            math.sqrt(
-                correlate_Krow["pixels"][i] ** 2 + correlate_Kcol["pixels"][i] ** 2
-            )
+    >>> edges({"height": 0, "width": 0, "pixels": []})
+    {'height': 0, 'width': 0, 'pixels': []}
+    """
+    # an empty axis has no edge pixels to extend the image with
+    if not image["height"] or not image["width"]:
+        return {"height": image["height"], "width": image["width"], "pixels": []}
+
+    # Krow = [[-1, -2, -1], [0, 0, 0], [1, 2, 1]]
+    # Kcol = [[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]]
+    # both Sobel kernels are outer products of [-1, 0, 1] and [1, 2, 1], so
+    # each output row needs only the three padded rows around it, and both
+    # gradients and the clipped magnitude come out of a single pass
+    edge_list = []
+    padded_rows = iter_padded_rows(image, 1, "extend")
+    window = deque(islice(padded_rows, 2), maxlen=3)
+    for _ in range(image["height"]):
+        window.append(next(padded_rows))
+        top, middle, bottom = window
+
+        smooth = [t + 2 * m + b for t, m, b in zip(top, middle, bottom)]
+        diff = [b - t for t, b in zip(top, bottom)]
+        correlate_Kcol = [right - left for left, right in zip(smooth, smooth[2:])]
+        correlate_Krow = [
+            left + 2 * center + right
+            for left, center, right in zip(diff, diff[1:], diff[2:])
+        ]
+
+        edge_list.extend(
+            [
+                min(255, round(math.sqrt(gy * gy + gx * gx)))
+                for gy, gx in zip(correlate_Krow, correlate_Kcol)
+            ]
         )
-        for i in range(len(correlate_Krow["pixels"]))
-    ]
-    edge_dict = {
+
+    return {
         "height": image["height"],
         "width": image["width"],
         "pixels": edge_list,
     }
 
-    return round_and_clip_image(edge_dict)
-
 
 # HELPER FUNCTIONS FOR LOADING AND SAVING IMAGES
 
+# weighted contribution of every possible channel value to the greyscale value
+GREY_RED = [0.299 * value for value in range(256)]
+GREY_GREEN = [0.587 * value for value in range(256)]
+GREY_BLUE = [0.114 * value for value in range(256)]
+
 
 def load_greyscale_image(filename):
     """
@@ -251,15 +491,20 @@ def load_greyscale_image(filename):
     """
     with open(filename, "rb") as img_handle:
         img = Image.open(img_handle)
-        img_data = img.getdata()
+        # work on the raw interleaved bytes, one byte per channel per pixel
+        raw = img.tobytes()
         if img.mode.startswith("RGB"):
+            # split the channels and look up each channel's weighted value
+            # instead of multiplying per pixel
+            bands = len(img.getbands())
             pixels = [
-                round(0.299 * p[0] + 0.587 * p[1] + 0.114 * p[2]) for p in img_data
+                round(GREY_RED[r] + GREY_GREEN[g] + GREY_BLUE[b])
+                for r, g, b in zip(raw[0::bands], raw[1::bands], raw[2::bands])
             ]
         elif img.mode == "LA":
-            pixels = [p[0] for p in img_data]
+            pixels = list(raw[0::2])
         elif img.mode == "L":
-            pixels = list(img_data)
+            pixels = list(raw)
         else:
             raise ValueError(f"Unsupported image mode: {img.mode}")
         width, height = img.size
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
+import functools
 import math
+from collections import deque
+from itertools import chain, groupby, islice
+
 from PIL import Image
 
 
@@ -18,32 +22,19 @@ def get_pixel(image, row, col, boundary_behavior):
     num_col = image["width"]
     pixel = image["pixels"]
 
-    if row < 0 or col < 0 or row >= num_row or col >= num_col:
-        if boundary_behavior == "zero":
-            return 0
-
-        elif boundary_behavior == "extend":
-            new_row = 0
-            new_col = 0
-            if row > num_row - 1:
-                new_row = num_row - 1
-            elif row < 0:
-                new_row = 0
-            else:
-                new_row = row
-            if col > num_col - 1:
-                new_col = num_col - 1
-            elif col < 0:
-                new_col = 0
-            else:
-                new_col = col
-            return pixel[int(new_row * num_col + new_col)]
-
-        elif boundary_behavior == "wrap":
-            return pixel[(row % num_row) * num_col + (col % num_col)]
-    else:
+    # in-bounds reads are by far the common case, so check for them first
+    if 0 <= row < num_row and 0 <= col < num_col:
         return pixel[int(row * num_col + col)]
 
+    if boundary_behavior == "zero":
+        return 0
+    elif boundary_behavior == "extend":
+        new_row = min(max(row, 0), num_row - 1)
+        new_col = min(max(col, 0), num_col - 1)
+        return pixel[int(new_row * num_col + new_col)]
+    elif boundary_behavior == "wrap":
+        return pixel[(row % num_row) * num_col + (col % num_col)]
+
 
 def set_pixel(image, row, col, color):
     """
@@ -61,17 +52,13 @@ def apply_per_pixel(image, func):
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
     """
-    result = {
+    # build the new pixels straight from the old ones, rather than copying the
+    # pixel list and then overwriting every entry of the copy
+    return {
         "height": image["height"],
         "width": image["width"],
-        "pixels": image["pixels"].copy(),
+        "pixels": [func(color) for color in image["pixels"]],
     }
-    for row in range(image["height"]):
-        for col in range(image["width"]):
-            color = get_pixel(image, row, col, None)
-            new_color = func(color)
-            set_pixel(result, row, col, new_color)
-    return result
 
 
 def inverted(image):
@@ -84,6 +71,100 @@ def inverted(image):
 # HELPER FUNCTIONS FROM LAB 1
 
 
+@functools.lru_cache(maxsize=128)
+def get_boundary_offsets(size, pad, boundary_behavior):
+    """
+    Return, for every position from -pad to size + pad - 1 along an axis of
+    the given size, the in-bounds position whose pixel should be read there
+    under the "extend" or "wrap" boundary behavior.
+
+    The tables only depend on the axis size, so they are cached and shared
+    by every filter (and every color channel) run on images of that size.
+    """
+    if boundary_behavior == "extend":
+        return tuple(min(max(index, 0), size - 1) for index in range(-pad, size + pad))
+    return tuple(index % size for index in range(-pad, size + pad))
+
+
+def get_padded_rows(image, pad, boundary_behavior):
+    """
+    Return the rows of the given image as a list of lists, with pad extra
+    pixels on every side filled in according to boundary_behavior.
+    """
+    pixels = image["pixels"]
+    num_row = image["height"]
+    num_col = image["width"]
+
+    # an empty axis has no edge pixels to extend or wrap around to, and no
+    # output pixel reads the padding then, so zeros give the right shape
+    if boundary_behavior == "zero" or not num_row or not num_col:
+        zeros = [0] * pad
+        return [
+            zeros + pixels[row * num_col : (row + 1) * num_col] + zeros
+            if 0 <= row < num_row
+            else [0] * (num_col + 2 * pad)
+            for row in range(-pad, num_row + pad)
+        ]
+
+    # the boundary is resolved through the offset tables, so padding is a
+    # plain gather with no per-pixel get_pixel call
+    col_offsets = get_boundary_offsets(num_col, pad, boundary_behavior)
+    padded = []
+    for row in get_boundary_offsets(num_row, pad, boundary_behavior):
+        row_pixels = pixels[row * num_col : (row + 1) * num_col]
+        padded.append([row_pixels[col] for col in col_offsets])
+    return padded
+
+
+def correlate_rows(rows, kernel_1d, width):
+    """
+    Correlate each of the given rows with a 1-D kernel, yielding width values
+    per row.  Every row must already be padded by len(kernel_1d) - 1 values.
+    """
+    for padded_row in rows:
+        new_row = [0] * width
+        for x, scale in enumerate(kernel_1d):
+            if scale != 0:
+                new_row = [
+                    total + pixel * scale
+                    for total, pixel in zip(new_row, padded_row[x : x + width])
+                ]
+        yield new_row
+
+
+def correlate_separable(image, column_kernel, row_kernel, boundary_behavior):
+    """
+    Compute the same result as correlate for the kernel whose value at (y, x)
+    is column_kernel[y] * row_kernel[x], using one 1-D pass along the rows and
+    one down the columns: 2K operations per pixel instead of K^2.
+
+    Both 1-D kernels must have the same length.
+    """
+    num_row = image["height"]
+    num_col = image["width"]
+    kernel_length = len(column_kernel)
+    padded = get_padded_rows(image, kernel_length // 2, boundary_behavior)
+
+    # rows first, produced lazily so that the column pass only ever holds the
+    # kernel_length horizontal rows under the kernel, not a whole float image
+    horizontal = correlate_rows(padded, row_kernel, num_col)
+    window = deque(islice(horizontal, kernel_length - 1), maxlen=kernel_length)
+
+    new_image_pixel = []
+    for row in range(num_row):
+        window.append(next(horizontal))
+        new_row = [0] * num_col
+        for scale, horizontal_row in zip(column_kernel, window):
+            if scale != 0:
+                new_row = [
+                    total + pixel * scale
+                    for total, pixel in zip(new_row, horizontal_row)
+                ]
+        new_image_pixel.extend(new_row)
+
+    return {"height": num_row, "width": num_col, "pixels": new_image_pixel}
+
+
 def correlate(image, kernel, boundary_behavior):
     """
     Compute the result of correlating the given image with the given kernel.
@@ -106,12 +187,20 @@ def correlate(image, kernel, boundary_behavior):
     DESCRIBE YOUR KERNEL REPRESENTATION HERE
     The kernel is a 2D list, where there are lists inside a list. Each inner list represents
     one row of the kernel.
+
+    >>> correlate({"height": 0, "width": 0, "pixels": []}, [[1]], "extend")
+    {'height': 0, 'width': 0, 'pixels': []}
+    >>> correlate({"height": 0, "width": 3, "pixels": []}, [[1]], "wrap")
+    {'height': 0, 'width': 3, 'pixels': []}
+    >>> correlate({"height": 2, "width": 0, "pixels": []}, [[1]], "extend")
+    {'height': 2, 'width': 0, 'pixels': []}
     """
 
     num_row = image["height"]
     num_col = image["width"]
 
     kernel_length = len(kernel)
+    half = kernel_length // 2
 
     new_image_pixel = []
 
@@ -121,19 +210,23 @@ def correlate(image, kernel, boundary_behavior):
         and boundary_behavior != "wrap"
     ):
         return None
+
+    # resolve the boundary once by padding the image, so that every kernel
+    # entry below reads a plain slice of a padded row
+    padded = get_padded_rows(image, half, boundary_behavior)
+
     for row in range(num_row):
-        for col in range(num_col):
-            new_pixel = 0
-            for y in range(kernel_length):
-                for x in range(kernel_length):
-                    new_col = col + x - kernel_length // 2
-                    new_row = row + y - kernel_length // 2
-                    val = (
-                        get_pixel(image, new_row, new_col, boundary_behavior)
-                        * kernel[y][x]
-                    )
-                    new_pixel += val
-            new_image_pixel.append(new_pixel)
+        # accumulate a whole output row at a time, one kernel entry per pass
+        new_row = [0] * num_col
+        for y, kernel_row in enumerate(kernel):
+            padded_row = padded[row + y]
+            for x, scale in enumerate(kernel_row):
+                if scale != 0:
+                    new_row = [
+                        total + pixel * scale
+                        for total, pixel in zip(new_row, padded_row[x : x + num_col])
+                    ]
+        new_image_pixel.extend(new_row)
 
     return {"height": num_row, "width": num_col, "pixels": new_image_pixel}
 
@@ -151,16 +244,11 @@ def round_and_clip_image(image):
     """
     row = image["height"]
     column = image["width"]
-    pixel = image["pixels"].copy()
-    pixel = [int(round(x)) for x in pixel]
-    new_pixel = []
-    for value in pixel:
-        if value < 0:
-            new_pixel.append(0)
-        elif value > 255:
-            new_pixel.append(255)
-        else:
-            new_pixel.append(value)
+    # round and clip in a single pass over the pixels
+    new_pixel = [
+        0 if value < 0 else 255 if value > 255 else value
+        for value in map(round, image["pixels"])
+    ]
     return {"height": row, "width": column, "pixels": new_pixel}
 
 
@@ -182,8 +270,32 @@ def blurred(image, kernel_size):
 
     # and, finally, make sure that the output is a valid image (using the
     # helper function from above) before returning it.
-    kernel = [[1 / (kernel_size**2)] * kernel_size] * kernel_size
-    correlation = correlate(image, kernel, "extend")
+    # the box kernel is the outer product of two uniform 1-D kernels
+    area = kernel_size**2
+    pixels = image["pixels"]
+
+    if (
+        area % 2
+        and pixels
+        and set(map(type, pixels)) <= {int}
+        and 0 <= min(pixels)
+        and max(pixels) <= 255
+    ):
+        # valid integer pixels are summed with an all-ones kernel, so the box
+        # sums stay exact integers; their averages are then rounded with
+        # integer arithmetic (an odd area can't produce a .5 tie) and need no
+        # clipping, since an average of values in [0, 255] stays in range
+        ones = [1] * kernel_size
+        sums = correlate_separable(image, ones, ones, "extend")["pixels"]
+        half_area = area // 2
+        return {
+            "height": image["height"],
+            "width": image["width"],
+            "pixels": [(total + half_area) // area for total in sums],
+        }
+
+    kernel = [1 / kernel_size] * kernel_size
+    correlation = correlate_separable(image, kernel, kernel, "extend")
     return round_and_clip_image(correlation)
 
 
@@ -195,18 +307,17 @@ def sharpened(image, n):
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
     """
-    pixel = image["pixels"].copy()
     blurred_image = blurred(image, n)
+    # sharpen, round and clip every pixel in a single pass
     sharpened_image_pixels = [
-        (2 * pixel[i] - blurred_image["pixels"][i]) for i in range(len(image["pixels"]))
+        0 if (value := round(2 * pixel - blur)) < 0 else 255 if value > 255 else value
+        for pixel, blur in zip(image["pixels"], blurred_image["pixels"])
     ]
-    return round_and_clip_image(
-        {
-            "height": image["height"],
-            "width": image["width"],
-            "pixels": sharpened_image_pixels,
-        }
-    )
+    return {
+        "height": image["height"],
+        "width": image["width"],
+        "pixels": sharpened_image_pixels,
+    }
 
 
 def edges(image):
@@ -217,46 +328,48 @@ def edges(image):
     This process should not mutate the input image; rather, it should create a
     separate structure to represent the output.
     """
-    Krow = [[-1, -2, -1], [0, 0, 0], [1, 2, 1]]
-    Kcol = [[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]]
-
-    correlate_Krow = correlate(image.copy(), Krow, "extend")
-    correlate_Kcol = correlate(image.copy(), Kcol, "extend")
-
-    edge_list = [
-        round(
-            math.sqrt(
-                correlate_Krow["pixels"][i] ** 2 + correlate_Kcol["pixels"][i] ** 2
-            )
+    # Krow = [[-1, -2, -1], [0, 0, 0], [1, 2, 1]]
+    # Kcol = [[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]]
+    # both Sobel kernels are outer products of [-1, 0, 1] and [1, 2, 1], so
+    # each output row needs only the three padded rows around it, and both
+    # gradients and the clipped magnitude come out of a single pass
+    padded = get_padded_rows(image, 1, "extend")
+    edge_list = []
+    for top, middle, bottom in zip(padded, padded[1:], padded[2:]):
+        smooth = [t + 2 * m + b for t, m, b in zip(top, middle, bottom)]
+        diff = [b - t for t, b in zip(top, bottom)]
+        correlate_Kcol = [right - left for left, right in zip(smooth, smooth[2:])]
+        correlate_Krow = [
+            left + 2 * center + right
+            for left, center, right in zip(diff, diff[1:], diff[2:])
+        ]
+
+        edge_list.extend(
+            [
+                min(255, round(math.sqrt(gy * gy + gx * gx)))
+                for gy, gx in zip(correlate_Krow, correlate_Kcol)
+            ]
         )
-        for i in range(len(correlate_Krow["pixels"]))
-    ]
-    edge_dict = {
+
+    return {
         "height": image["height"],
         "width": image["width"],
         "pixels": edge_list,
     }
 
-    return round_and_clip_image(edge_dict)
-
 
 # VARIOUS FILTERS
 
 
-def separate(image):  # NEED TO MAKE FASTER
+def separate(image):
     """
     Given an image, returns a dictionary of separate lists of red values,
     green values, and blue values of the given image. 
     """
-    pixel = image["pixels"].copy()
-    r_list = []
-    g_list = []
-    b_list = []
-    for r, g, b in pixel:
-        r_list.append(r)
-        g_list.append(g)
-        b_list.append(b)
-    return {"red": r_list, "green": g_list, "blue": b_list}
+    # flatten the (r, g, b) tuples into one r, g, b, r, g, b, ... list, so each
+    # channel is a single strided slice of it
+    flat = list(chain.from_iterable(image["pixels"]))
+    return {"red": flat[0::3], "green": flat[1::3], "blue": flat[2::3]}
 
 
 def combine(r_im, g_im, b_im):
@@ -266,10 +379,7 @@ def combine(r_im, g_im, b_im):
 
     Undoes the separate function.
     """
-    r_pixel = r_im["pixels"].copy()
-    g_pixel = g_im["pixels"].copy()
-    b_pixel = b_im["pixels"].copy()
-    combined_pixel = list(zip(r_pixel, g_pixel, b_pixel))
+    combined_pixel = list(zip(r_im["pixels"], g_im["pixels"], b_im["pixels"]))
     return {"height": r_im["height"], "width": r_im["width"], "pixels": combined_pixel}
 
 
@@ -302,6 +412,8 @@ def color_filter_from_greyscale_filter(filt):
         b_new = filt(b_image)
         return combine(r_new, g_new, b_new)
 
+    # lets filter_cascade run consecutive color filters channel by channel
+    create_filtered_image.greyscale_filter = filt
     return create_filtered_image
 
 
@@ -333,9 +445,24 @@ def filter_cascade(filters):
     output as applying each of the individual ones in turn.
     """
 
+    # a run of color filters that each wrap a greyscale filter is applied as
+    # one color filter wrapping the whole greyscale run, so the channels are
+    # separated and combined once per run instead of once per filter
+    stages = []
+    for wraps_greyscale, group in groupby(
+        filters, key=lambda filter: hasattr(filter, "greyscale_filter")
+    ):
+        if wraps_greyscale:
+            greyscale_run = [filter.greyscale_filter for filter in group]
+            stages.append(
+                color_filter_from_greyscale_filter(filter_cascade(greyscale_run))
+            )
+        else:
+            stages.extend(group)
+
     def filt(image):
         new_image = image.copy()
-        for filter in filters:
+        for filter in stages:
             new_image = filter(new_image)
         return new_image
 
@@ -357,28 +484,38 @@ def seam_carving(image, ncols):
         "width": image["width"],
         "pixels": image["pixels"].copy(),
     }
+    # the greyscale image and its energy are carried from one seam to the
+    # next, rather than recomputed from the color image every time
+    grey = greyscale_image_from_color_image(new_image)
+    energy = compute_energy(grey)
     for i in range(ncols):
-        seam = minimum_energy_seam(
-            cumulative_energy_map(
-                compute_energy(greyscale_image_from_color_image(new_image))
-            )
-        )
+        seam = minimum_energy_seam(cumulative_energy_map(energy))
         new_image = image_without_seam(new_image, seam)
+        grey = image_without_seam(grey, seam)
+        energy = image_without_seam(energy, seam)
+        update_energy_near_seam(grey, energy, seam)
     return new_image
 
 
 # Optional Helper Functions for Seam Carving
 
 
+# weighted contribution of every possible channel value to the greyscale value
+GREY_RED = [0.299 * value for value in range(256)]
+GREY_GREEN = [0.587 * value for value in range(256)]
+GREY_BLUE = [0.114 * value for value in range(256)]
+
+
 def greyscale_image_from_color_image(image):
     """
     Given a color image, computes and returns a corresponding greyscale image.
 
     Returns a greyscale image (represented as a dictionary).
     """
-    new_pixel = []
-    for r, g, b in image["pixels"]:
-        new_pixel.append(round(0.299 * r + 0.587 * g + 0.114 * b))
+    # table lookups give exactly the products the weighted sum would compute
+    new_pixel = [
+        round(GREY_RED[r] + GREY_GREEN[g] + GREY_BLUE[b]) for r, g, b in image["pixels"]
+    ]
     return {"height": image["height"], "width": image["width"], "pixels": new_pixel}
 
 
@@ -404,34 +541,23 @@ def cumulative_energy_map(energy):
     """
     num_row = energy["height"]
     num_col = energy["width"]
-    new_energy = energy.copy()
-    pixel = new_energy["pixels"].copy()
-    new_energy["pixels"] = pixel
-
-    for row in range(num_row):
-        for col in range(num_col):
-            if row == 0:
-                continue
-            elif col == 0:
-                minimum = min(
-                    get_pixel(new_energy, row - 1, col, None),
-                    get_pixel(new_energy, row - 1, col + 1, None),
-                )
-            elif col == num_col - 1:
-                minimum = min(
-                    get_pixel(new_energy, row - 1, col - 1, None),
-                    get_pixel(new_energy, row - 1, col, None),
-                )
-            else:
-                minimum = min(
-                    get_pixel(new_energy, row - 1, col - 1, None),
-                    get_pixel(new_energy, row - 1, col, None),
-                    get_pixel(new_energy, row - 1, col + 1, None),
-                )
-            set_pixel(
-                new_energy, row, col, get_pixel(new_energy, row, col, None) + minimum
+    pixel = energy["pixels"]
+
+    previous = pixel[:num_col]
+    new_pixel = list(previous)
+    for row in range(1, num_row):
+        # the cheapest of the pixels above each column, for a whole row at
+        # once; repeating the edge values keeps the edge columns to their two
+        # real neighbours
+        padded = previous[:1] + previous + previous[-1:]
+        previous = [
+            value + min(left, up, right)
+            for value, left, up, right in zip(
+                pixel[row * num_col : (row + 1) * num_col], padded, previous, padded[2:]
             )
-    return {"height": energy["height"], "width": energy["width"], "pixels": pixel}
+        ]
+        new_pixel.extend(previous)
+    return {"height": energy["height"], "width": energy["width"], "pixels": new_pixel}
 
 
 def minimum_energy_seam(cem):
@@ -442,52 +568,20 @@ def minimum_energy_seam(cem):
     """
     num_row = cem["height"]
     num_col = cem["width"]
-    cem_copy = cem.copy()
-    bottom_index_list = []
-
-    bottom_row = []
-    for col in range(num_col):
-        bottom_row.append(get_pixel(cem_copy, num_row - 1, col, None))
-        bottom_index_list.append(num_col * num_row - (num_col - col))
-
-    bottom_min_val = min(bottom_row)
-    min_index = bottom_index_list[bottom_row.index(bottom_min_val)]
-
-    index_list = [min_index]
-
-    min_row = min_index // num_col
-    min_col = min_index % num_col
-
-    for row in range(num_row - 1):
-        new_row = min_row - row - 1
-        if min_col == 0:
-            minimum = min(
-                get_pixel(cem_copy, new_row, min_col, None),
-                get_pixel(cem_copy, new_row, min_col + 1, None),
-            )
-            index_list.append(cem_copy["pixels"].index(minimum, min_index - num_col))
-
-        elif min_col == num_col - 1:
-            minimum = min(
-                get_pixel(cem_copy, new_row, min_col - 1, None),
-                get_pixel(cem_copy, new_row, min_col, None),
-            )
-            index_list.append(
-                cem_copy["pixels"].index(minimum, min_index - num_col - 1)
-            )
-
-        else:
-            minimum = min(
-                get_pixel(cem_copy, new_row, min_col - 1, None),
-                get_pixel(cem_copy, new_row, min_col, None),
-                get_pixel(cem_copy, new_row, min_col + 1, None),
-            )
-            index_list.append(
-                cem_copy["pixels"].index(minimum, min_index - num_col - 1)
-            )
-
-        min_col = index_list[-1] % num_col
-        min_index = index_list[-1]
+    pixel = cem["pixels"]
+
+    # track the seam's column directly; ties go to the leftmost pixel
+    start = (num_row - 1) * num_col
+    bottom_row = pixel[start:]
+    min_col = bottom_row.index(min(bottom_row))
+    index_list = [start + min_col]
+
+    for start in range(start - num_col, -1, -num_col):
+        # only the (up to) three pixels above the current one are candidates
+        left = max(min_col - 1, 0)
+        neighbors = pixel[start + left : start + min(min_col + 2, num_col)]
+        min_col = left + neighbors.index(min(neighbors))
+        index_list.append(start + min_col)
     return index_list
 
 
@@ -498,58 +592,83 @@ def image_without_seam(image, seam):
     pixels from the original image except those corresponding to the locations
     in the given list.
     """
-    new_image = image.copy()
-    new_pixel = [value for i, value in enumerate(new_image["pixels"]) if i not in seam]
+    pixel = image["pixels"]
+    # copy the runs of pixels between removed indices as whole slices, rather
+    # than testing every pixel for membership in the seam
+    new_pixel = []
+    start = 0
+    for index in sorted(set(seam)):
+        new_pixel.extend(pixel[start:index])
+        start = index + 1
+    new_pixel.extend(pixel[start:])
     return {"height": image["height"], "width": image["width"] - 1, "pixels": new_pixel}
 
 
-def custom_feature(image):
+def update_energy_near_seam(grey, energy, seam):
     """
-    Given a color image, return a new image where the top third of the image is
-    just red values, middle is blue values, and bottom is green values.
+    Given a greyscale image and its energy (as computed by compute_energy),
+    both with the given seam already removed, recompute in place the energy
+    of the pixels whose neighborhood the seam passed through.  The seam's
+    indices refer to the images before removal, one pixel per row.
+
+    Every other pixel sees exactly the same neighbors as before the removal,
+    so its energy is unchanged.
     """
-    rbg_dict = separate(image)
-    r_image = {
-        "height": image["height"],
-        "width": image["width"],
-        "pixels": rbg_dict["red"],
-    }
-    g_image = {
-        "height": image["height"],
-        "width": image["width"],
-        "pixels": rbg_dict["green"],
-    }
-    b_image = {
-        "height": image["height"],
-        "width": image["width"],
-        "pixels": rbg_dict["blue"],
-    }
+    num_row = grey["height"]
+    num_col = grey["width"]
+    pixel = grey["pixels"]
+    energy_pixel = energy["pixels"]
 
-    new_r = []
-    new_g = []
-    new_b = []
-
-    length = len(r_image["pixels"])
-
-    for pix in range(length):
-        if len(new_r) <= length // 3:
-            new_r.append(r_image["pixels"][pix])
-            new_b.append(0)
-            new_g.append(0)
-        elif len(new_g) > length // 3 and len(new_g) <= 2 * (length // 3):
-            new_r.append(0)
-            new_g.append(g_image["pixels"][pix])
-            new_b.append(0)
-        else:
-            new_r.append(0)
-            new_g.append(0)
-            new_b.append(b_image["pixels"][pix])
+    seam_col = [0] * num_row
+    for index in seam:
+        seam_col[index // (num_col + 1)] = index % (num_col + 1)
+
+    for row in range(num_row):
+        above = max(row - 1, 0)
+        below = min(row + 1, num_row - 1)
+        # columns left of this band keep their neighbors, and columns right of
+        # it had all their neighbors shift left together
+        near = seam_col[above : below + 1]
+        top = above * num_col
+        middle = row * num_col
+        bottom = below * num_col
+        for col in range(max(min(near) - 1, 0), min(max(near) + 1, num_col)):
+            left = max(col - 1, 0)
+            right = min(col + 1, num_col - 1)
+            # the same Sobel gradients edges computes, with "extend" boundaries
+            gy = (
+                pixel[bottom + left]
+                - pixel[top + left]
+                + 2 * (pixel[bottom + col] - pixel[top + col])
+                + pixel[bottom + right]
+                - pixel[top + right]
+            )
+            gx = (
+                pixel[top + right]
+                + 2 * pixel[middle + right]
+                + pixel[bottom + right]
+                - pixel[top + left]
+                - 2 * pixel[middle + left]
+                - pixel[bottom + left]
+            )
+            energy_pixel[middle + col] = min(255, round(math.sqrt(gy * gy + gx * gx)))
 
-    r_im = {"height": image["height"], "width": image["width"], "pixels": new_r}
-    b_im = {"height": image["height"], "width": image["width"], "pixels": new_b}
-    g_im = {"height": image["height"], "width": image["width"], "pixels": new_g}
 
-    return combine(r_im, g_im, b_im)
+def custom_feature(image):
+    """
+    Given a color image, return a new image where the top third of the image is
+    just red values, middle is green values, and bottom is blue values.
+    """
+    pixel = image["pixels"]
+    # the bands are whole rows, so each one is a single slice of the pixels
+    first = (image["height"] // 3) * image["width"]
+    second = 2 * first
+    new_pixel = (
+        [(r, 0, 0) for r, _, _ in pixel[:first]]
+        + [(0, g, 0) for _, g, _ in pixel[first:second]]
+        + [(0, 0, b) for _, _, b in pixel[second:]]
+    )
+    return {"height": image["height"], "width": image["width"], "pixels": new_pixel}
 
 
 
@@ -580,8 +699,14 @@ def save_color_image(image, filename, mode="PNG"):
     If filename is given as a file-like object, the file type will be
     determined by the 'mode' parameter.
     """
-    out = Image.new(mode="RGB", size=(image["width"], image["height"]))
-    out.putdata(image["pixels"])
+    size = (image["width"], image["height"])
+    try:
+        # valid pixels are handed to Pillow as one raw buffer, which it copies
+        # in C instead of iterating over the list of tuples
+        out = Image.frombytes("RGB", size, bytes(chain.from_iterable(image["pixels"])))
+    except (TypeError, ValueError):
+        out = Image.new(mode="RGB", size=size)
+        out.putdata(image["pixels"])
     if isinstance(filename, str):
         out.save(filename)
     else:
@@ -602,7 +727,8 @@ def load_greyscale_image(filename):
         img_data = img.getdata()
         if img.mode.startswith("RGB"):
             pixels = [
-                round(0.299 * p[0] + 0.587 * p[1] + 0.114 * p[2]) for p in img_data
+                round(GREY_RED[p[0]] + GREY_GREEN[p[1]] + GREY_BLUE[p[2]])
+                for p in img_data
             ]
         elif img.mode == "LA":
             pixels = [p[0] for p in img_data]
@@ -621,8 +747,14 @@ def save_greyscale_image(image, filename, mode="PNG"):
     filename is given as a file-like object, the file type will be determined
     by the 'mode' parameter.
     """
-    out = Image.new(mode="L", size=(image["width"], image["height"]))
-    out.putdata(image["pixels"])
+    size = (image["width"], image["height"])
+    try:
+        # valid pixels are handed to Pillow as one raw buffer, which it copies
+        # in C instead of iterating over the list
+        out = Image.frombytes("L", size, bytes(image["pixels"]))
+    except (TypeError, ValueError):
+        out = Image.new(mode="L", size=size)
+        out.putdata(image["pixels"])
     if isinstance(filename, str):
         out.save(filename)
     else:
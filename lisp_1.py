@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import re
 import sys
 import doctest
 
@@ -65,13 +66,26 @@ def number_or_symbol(value):
     >>> number_or_symbol('x')
     'x'
     """
-    try:
-        return int(value)
-    except ValueError:
+    # only a digit, a sign or a point can start a number other than inf and
+    # nan, so most symbols skip the two failed conversions
+    first = value[:1]
+    if first.isdigit() or (first in "+-." and len(value) > 1):
         try:
-            return float(value)
+            return int(value)
         except ValueError:
-            return value
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    elif value.lower() in ("inf", "infinity", "nan"):
+        return float(value)
+    # interned, so frame lookups of this symbol can match by identity
+    return sys.intern(value)
+
+
+# a comment runs from a semicolon to the end of its line, where a line ends at
+# any of the boundaries str.splitlines splits on
+COMMENT_PATTERN = re.compile(r";[^\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*")
 
 
 def tokenize(source):
@@ -82,17 +96,13 @@ def tokenize(source):
     Arguments:
         source (str): a string containing the source code of a Scheme
                       expression
+
+    >>> tokenize('; comment\x0c(+ 1 2)')
+    ['(', '+', '1', '2', ')']
     """
-    line_list = source.splitlines()
-    return_list = []
-    for line in line_list:
-        expression, symbol, comment = line.partition(";")
-        if ")" in comment:
-            expression += ")"
-        new_exp = expression.replace("(", " ( ")
-        new_exp = new_exp.replace(")", " ) ")
-        return_list.extend(item for item in new_exp.split())
-    return return_list
+    # drop the comments, then split the whole source at once
+    source = COMMENT_PATTERN.sub("", source)
+    return source.replace("(", " ( ").replace(")", " ) ").split()
 
 
 def parse(tokens):
@@ -114,34 +124,30 @@ def parse(tokens):
     >>> parse(['(', '+', '2', '(', '-', '5', '3', ')', '7', '8', ')'])
     ['+', 2, ['-', 5, 3], 7, 8]
     """
-    num_char = len(tokens)
+    last_index = len(tokens) - 1
+    # one partial list per "(" that hasn't been closed yet
+    stack = []
 
-    def parse_expression(index):
-        token = number_or_symbol(tokens[index])
-        if isinstance(token, (int, float)):
-            return token, index + 1
+    for index, token in enumerate(tokens):
         if token == "(":
-            expression_list = []
-            curr_index = index + 1
-            if curr_index > num_char - 1:
+            stack.append([])
+            continue
+        if token == ")":
+            if not stack:  # if there's an extra parenthesis
                 raise SchemeSyntaxError
-            while tokens[curr_index] != ")":
-                curr_exp, upcoming_index = parse_expression(curr_index)
-                expression_list.append(curr_exp)
-                curr_index = upcoming_index
-                if curr_index > num_char - 1:
-                    raise SchemeSyntaxError
-            return expression_list, curr_index + 1
-        if token == ")":  # if there's an extra parenthesis
-            raise SchemeSyntaxError
-        return token, index + 1
-
-    parsed_expression, next_index = parse_expression(0)
+            expression = stack.pop()
+        else:
+            expression = number_or_symbol(token)
 
-    if next_index < num_char:  # if there are extra items not in ()
-        raise SchemeSyntaxError
+        if stack:
+            stack[-1].append(expression)
+        elif index == last_index:
+            return expression
+        else:  # if there are extra items not in ()
+            raise SchemeSyntaxError
 
-    return parsed_expression
+    # no tokens at all, or a "(" that was never closed
+    raise SchemeSyntaxError
 
 
 ####################
@@ -154,21 +160,22 @@ class Frames:
     class to represent frames
     """
 
+    __slots__ = ("parent", "children")
+
     def __init__(self, grandparent=None):
-        if grandparent:
+        if grandparent is not None:
             self.parent = grandparent
         else:
-            self.parent = scheme_builtins
+            self.parent = builtins_frame
         self.children = {}  # variable: value
 
     def __getitem__(self, var):
-        if var in self.children:
-            return self.children[var]
-        elif self.parent:
-            try:
-                return self.parent.__getitem__(var)
-            except KeyError:
-                raise SchemeNameError
+        # climb the frames in a loop; the chain always ends at builtins_frame
+        frame = self
+        while frame is not None:
+            if var in frame.children:
+                return frame.children[var]
+            frame = frame.parent
         raise SchemeNameError
 
     def __setitem__(self, var, val):
@@ -180,6 +187,8 @@ class Functions:
     class to represent functions
     """
 
+    __slots__ = ("body", "param", "frame")
+
     def __init__(self, body, param, frame):
         self.body = body
         self.param = param
@@ -189,8 +198,7 @@ class Functions:
         if len(args) != len(self.param):
             raise SchemeEvaluationError
         frame = Frames(self.frame)
-        for i, value in enumerate(args):
-            frame.children[self.param[i]] = value
+        frame.children = dict(zip(self.param, args))
         return evaluate(self.body, frame)
 
 
@@ -199,10 +207,34 @@ class Functions:
 ######################
 
 
+def add(args):
+    """
+    Given a list of values, return the result of adding all together.
+    """
+    # most calls have two arguments, so skip building up a sum for those
+    if len(args) == 2:
+        return args[0] + args[1]
+    return sum(args)
+
+
+def sub(args):
+    """
+    Given a list of values, return the first minus all of the others, or
+    the negation of the only one.
+    """
+    if len(args) == 2:
+        return args[0] - args[1]
+    if len(args) == 1:
+        return -args[0]
+    return args[0] - sum(args[1:])
+
+
 def mul(args):
     """
     Given a list of values, return the result of multiplying all together.
     """
+    if len(args) == 2:
+        return args[0] * args[1]
     result = 1
     for num in args:
         result *= num
@@ -215,6 +247,8 @@ def div(args):
     """
     if not args:
         raise ValueError
+    if len(args) == 2:
+        return args[0] / args[1]
     result = args[0]
     if len(args) == 1:
         return 1 / result
@@ -224,12 +258,17 @@ def div(args):
 
 
 scheme_builtins = {
-    "+": sum,
-    "-": lambda args: -args[0] if len(args) == 1 else (args[0] - sum(args[1:])),
+    "+": add,
+    "-": sub,
     "*": mul,
     "/": div,
 }
 
+# the frame at the end of every parent chain, holding the builtins
+builtins_frame = Frames.__new__(Frames)
+builtins_frame.parent = None
+builtins_frame.children = scheme_builtins
+
 
 ##############
 # Evaluation #
@@ -251,12 +290,20 @@ def evaluate(tree, frame=None):
     >>> evaluate(['+', 3, ['-', 7, 5]])
     5
     """
-    if not frame:
+    if frame is None:
         frame = Frames()
-    if isinstance(tree, str):
+    # exact type checks first, since names and numbers are most of the tree
+    tree_type = type(tree)
+    if tree_type is str:
         return frame[tree]
-    if isinstance(tree, (int, float)):
+    if tree_type is int or tree_type is float:
         return tree
+    if tree_type is not list:
+        # subclasses, such as bool, take the slower checks
+        if isinstance(tree, str):
+            return frame[tree]
+        if isinstance(tree, (int, float)):
+            return tree
     if isinstance(tree, list):
         if tree[0] == "define":
             if isinstance(tree[1], str):
@@ -277,6 +324,14 @@ def evaluate(tree, frame=None):
         maybe_func = evaluate(tree[0], frame)
         if not callable(maybe_func):
             raise SchemeEvaluationError("first element is not a valid function")
+        if type(maybe_func) is Functions and len(tree) - 1 == len(maybe_func.param):
+            # bind each argument as it is evaluated, with no list in between
+            new_frame = Frames(maybe_func.frame)
+            new_frame.children = {
+                name: evaluate(subtree, frame)
+                for name, subtree in zip(maybe_func.param, tree[1:])
+            }
+            return evaluate(maybe_func.body, new_frame)
         return maybe_func([evaluate(subtree, frame) for subtree in tree[1:]])
 
 
@@ -285,7 +340,7 @@ def result_and_frame(tree, frame=None):
     Given a tree, returns a tuple with two elements: the result of the
     evaluation and the frame in which the expression was evaluated.
     """
-    if not frame:
+    if frame is None:
         frame = Frames()
     return evaluate(tree, frame), frame
 
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import os
+import re
 import sys
 
 sys.setrecursionlimit(20_000)
@@ -62,13 +64,26 @@ def number_or_symbol(value):
     >>> number_or_symbol('x')
     'x'
     """
-    try:
-        return int(value)
-    except ValueError:
+    # only a digit, a sign or a point can start a number other than inf and
+    # nan, so most symbols skip the two failed conversions
+    first = value[:1]
+    if first.isdigit() or (first in "+-." and len(value) > 1):
         try:
-            return float(value)
+            return int(value)
         except ValueError:
-            return value
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    elif value.lower() in ("inf", "infinity", "nan"):
+        return float(value)
+    # interned, so frame lookups of this symbol can match by identity
+    return sys.intern(value)
+
+
+# a comment runs from a semicolon to the end of its line, where a line ends at
+# any of the boundaries str.splitlines splits on
+COMMENT_PATTERN = re.compile(r";[^\n\r\v\f\x1c-\x1e\x85\u2028\u2029]*")
 
 
 def tokenize(source):
@@ -79,17 +94,13 @@ def tokenize(source):
     Arguments:
         source (str): a string containing the source code of a Scheme
                       expression
+
+    >>> tokenize('; comment\x0c(+ 1 2)')
+    ['(', '+', '1', '2', ')']
     """
-    line_list = source.splitlines()
-    return_list = []
-    for line in line_list:
-        expression, symbol, comment = line.partition(";")
-        if ")" in comment:
-            expression += ")"
-        new_exp = expression.replace("(", " ( ")
-        new_exp = new_exp.replace(")", " ) ")
-        return_list.extend(item for item in new_exp.split())
-    return return_list
+    # drop the comments, then split the whole source at once
+    source = COMMENT_PATTERN.sub("", source)
+    return source.replace("(", " ( ").replace(")", " ) ").split()
 
 
 def parse(tokens):
@@ -111,34 +122,30 @@ def parse(tokens):
     >>> parse(['(', '+', '2', '(', '-', '5', '3', ')', '7', '8', ')'])
     ['+', 2, ['-', 5, 3], 7, 8]
     """
-    num_char = len(tokens)
+    last_index = len(tokens) - 1
+    # one partial list per "(" that hasn't been closed yet
+    stack = []
 
-    def parse_expression(index):
-        token = number_or_symbol(tokens[index])
-        if isinstance(token, (int, float)):
-            return token, index + 1
+    for index, token in enumerate(tokens):
         if token == "(":
-            expression_list = []
-            curr_index = index + 1
-            if curr_index > num_char - 1:
+            stack.append([])
+            continue
+        if token == ")":
+            if not stack:  # if there's an extra parenthesis
                 raise SchemeSyntaxError
-            while tokens[curr_index] != ")":
-                curr_exp, upcoming_index = parse_expression(curr_index)
-                expression_list.append(curr_exp)
-                curr_index = upcoming_index
-                if curr_index > num_char - 1:
-                    raise SchemeSyntaxError
-            return expression_list, curr_index + 1
-        if token == ")":  # if there's an extra parenthesis
-            raise SchemeSyntaxError
-        return token, index + 1
-
-    parsed_expression, next_index = parse_expression(0)
+            expression = stack.pop()
+        else:
+            expression = number_or_symbol(token)
 
-    if next_index < num_char:  # if there are extra items not in ()
-        raise SchemeSyntaxError
+        if stack:
+            stack[-1].append(expression)
+        elif index == last_index:
+            return expression
+        else:  # if there are extra items not in ()
+            raise SchemeSyntaxError
 
-    return parsed_expression
+    # no tokens at all, or a "(" that was never closed
+    raise SchemeSyntaxError
 
 
 ####################
@@ -151,37 +158,36 @@ class Frames:
     class to represent frames
     """
 
+    __slots__ = ("parent", "children")
+
     def __init__(self, grandparent=None):
-        if grandparent:
+        if grandparent is not None:
             self.parent = grandparent
         else:
-            self.parent = scheme_builtins
+            self.parent = builtins_frame
         self.children = {}  # variable: value
 
     def __getitem__(self, var):
-        if var in self.children:
-            return self.children[var]
-        elif self.parent:
-            try:
-                return self.parent.__getitem__(var)
-            except KeyError:
-                raise SchemeNameError
-        else:
-            raise SchemeNameError
+        # climb the frames in a loop; the chain always ends at builtins_frame
+        frame = self
+        while frame is not None:
+            if var in frame.children:
+                return frame.children[var]
+            frame = frame.parent
+        raise SchemeNameError
 
     def __setitem__(self, var, val):
         self.children[var] = val
 
     def set_parent(self, var, val):
-        if var in self.children:
-            self.children[var] = val
-        elif self.parent:
-            try:
-                self.parent.set_parent(var, val)
-            except AttributeError:  # if its parent is scheme_builtins
-                raise SchemeNameError
-        else:
-            raise SchemeNameError
+        # builtins can't be rebound, so stop before builtins_frame
+        frame = self
+        while frame is not builtins_frame:
+            if var in frame.children:
+                frame.children[var] = val
+                return
+            frame = frame.parent
+        raise SchemeNameError
 
 
 class Functions:
@@ -189,18 +195,25 @@ class Functions:
     class to represent functions
     """
 
+    __slots__ = ("body", "param", "frame")
+
     def __init__(self, body, param, frame):
         self.body = body
         self.param = param
         self.frame = frame
 
     def __call__(self, args):
+        return evaluate(self.body, self.call_frame(args))
+
+    def call_frame(self, args):
+        """
+        Returns the frame the body runs in when called with args.
+        """
         if len(args) != len(self.param):
             raise SchemeEvaluationError
         frame = Frames(self.frame)
-        for i, value in enumerate(args):
-            frame.children[self.param[i]] = value
-        return evaluate(self.body, frame)
+        frame.children = dict(zip(self.param, args))
+        return frame
 
 
 class Pair:
@@ -208,6 +221,9 @@ class Pair:
     class to represent pairs
     """
 
+    # one per cons cell, so skip the per-instance __dict__
+    __slots__ = ("car", "cdr")
+
     def __init__(self, car, cdr):
         self.car = car
         self.cdr = cdr
@@ -218,10 +234,34 @@ class Pair:
 ######################
 
 
+def add(args):
+    """
+    Given a list of arguments, return the result of adding all together.
+    """
+    # most calls have two arguments, so skip building up a sum for those
+    if len(args) == 2:
+        return args[0] + args[1]
+    return sum(args)
+
+
+def sub(args):
+    """
+    Given a list of arguments, return the first minus all of the others, or
+    the negation of the only one.
+    """
+    if len(args) == 2:
+        return args[0] - args[1]
+    if len(args) == 1:
+        return -args[0]
+    return args[0] - sum(args[1:])
+
+
 def mul(args):
     """
     Given a list of arguments, return the result of multiplying all together.
     """
+    if len(args) == 2:
+        return args[0] * args[1]
     result = 1
     for num in args:
         result *= num
@@ -234,6 +274,8 @@ def div(args):
     """
     if not args:
         raise ValueError
+    if len(args) == 2:
+        return args[0] / args[1]
     result = args[0]
     if len(args) == 1:
         return 1 / result
@@ -246,51 +288,62 @@ def equal(args):
     """
     Given a list of arguments, returns True if all are equal, False otherwise.
     """
-    return len(set(args)) == 1
+    if not args:
+        return False
+    first = args[0]
+    for value in args[1:]:
+        # same test a set uses to merge members: identity, then ==
+        if value is not first and not value == first:
+            return False
+    return True
 
 
 def greater(args):
     """
     Given a list of arguments, returns True if in decreasing order, False otherwise.
     """
-    iscorrect = True
+    if len(args) == 2:
+        return not args[0] <= args[1]
     for i in range(len(args) - 1):
         if args[i] <= args[i + 1]:
-            iscorrect = False
-    return iscorrect
+            return False
+    return True
 
 
 def ge(args):
     """
     Given a list of arguments, returns True if in nonincreasing order, False otherwise.
     """
-    iscorrect = True
+    if len(args) == 2:
+        return not args[0] < args[1]
     for i in range(len(args) - 1):
         if args[i] < args[i + 1]:
-            iscorrect = False
-    return iscorrect
+            return False
+    return True
 
 
 def less(args):
     """
     Given a list of arguments, returns True if in increasing order, False otherwise.
     """
-    iscorrect = True
+    if len(args) == 2:
+        return not args[0] >= args[1]
     for i in range(len(args) - 1):
         if args[i] >= args[i + 1]:
-            iscorrect = False
-    return iscorrect
+            return False
+    return True
 
 
 def le(args):
     """
     Given a list of arguments, returns True if in nondecreasing order, False otherwise.
     """
-    iscorrect = True
+    if len(args) == 2:
+        return not args[0] > args[1]
     for i in range(len(args) - 1):
         if args[i] > args[i + 1]:
-            iscorrect = False
-    return iscorrect
+            return False
+    return True
 
 
 def not_func(args):
@@ -360,9 +413,11 @@ def list_func(args):
 
     If there are no arguments, returns None.
     """
-    if not args:
-        return None
-    return Pair(args[0], list_func(args[1:]))
+    # build from the back so each Pair can point at the rest of the list
+    result = None
+    for value in reversed(args):
+        result = Pair(value, result)
+    return result
 
 
 def check_list(args):
@@ -370,11 +425,12 @@ def check_list(args):
     Given an arbitrary argument, returns #t if that object is a linked
     list, and #f otherwise.
     """
-    if args[0] is None:
-        return True
-    if not isinstance(args[0], Pair):
-        return False
-    return check_list([args[0].cdr])
+    current = args[0]
+    while current is not None:
+        if not isinstance(current, Pair):
+            return False
+        current = current.cdr
+    return True
 
 
 def len_list(args):
@@ -405,14 +461,17 @@ def list_index(args):
     """
     current = args[0]
     index = args[1]
-    if not check_list([current]) and isinstance(current, Pair):
-        if index != 0:
+    if not check_list([current]):
+        if not isinstance(current, Pair) or index != 0:
             raise SchemeEvaluationError
-        return args[0].car
-    if index >= len_list([current]):
-        raise SchemeEvaluationError
+        return current.car
+    # walk straight to the index, stopping if the list runs out first
     for i in range(index):
+        if current is None:
+            raise SchemeEvaluationError
         current = current.cdr
+    if current is None:
+        raise SchemeEvaluationError
     return current.car
 
 
@@ -433,8 +492,8 @@ def list_append(args):
         if not check_list([arg]):
             raise SchemeEvaluationError
         current = arg
-        while current:
-            if not head:
+        while current is not None:
+            if head is None:
                 head = Pair(current.car, None)
                 tail = head
             else:
@@ -453,11 +512,17 @@ def map_func(args):
     LL = args[1]
     if not callable(func) or not check_list([LL]):
         raise SchemeEvaluationError
-    result = None
-    for i in range(len_list([LL])):
-        current = list_index([LL, i])
-        curr_val = func([current])
-        result = list_append([result, Pair(curr_val, None)])
+    # one walk down LL, keeping the tail so each new Pair is added in place
+    result = tail = None
+    current = LL
+    while current is not None:
+        node = Pair(func([current.car]), None)
+        if result is None:
+            result = tail = node
+        else:
+            tail.cdr = node
+            tail = node
+        current = current.cdr
     return result
 
 
@@ -470,11 +535,17 @@ def filter_func(args):
     LL = args[1]
     if not callable(func) or not check_list([LL]):
         raise SchemeEvaluationError
-    result = None
-    for i in range(len_list([LL])):
-        current = list_index([LL, i])
-        if func([current]):
-            result = list_append([result, Pair(current, None)])
+    result = tail = None
+    current = LL
+    while current is not None:
+        if func([current.car]):
+            node = Pair(current.car, None)
+            if result is None:
+                result = tail = node
+            else:
+                tail.cdr = node
+                tail = node
+        current = current.cdr
     return result
 
 
@@ -488,8 +559,10 @@ def reduce_func(args):
     initial = args[2]
     if not callable(func) or not check_list([LL]):
         raise SchemeEvaluationError
-    for i in range(len_list([LL])):
-        initial = func([initial, list_index([LL, i])])
+    current = LL
+    while current is not None:
+        initial = func([initial, current.car])
+        current = current.cdr
     return initial
 
 
@@ -501,8 +574,8 @@ def begin(args):
 
 
 scheme_builtins = {
-    "+": sum,
-    "-": lambda args: -args[0] if len(args) == 1 else (args[0] - sum(args[1:])),
+    "+": add,
+    "-": sub,
     "*": mul,
     "/": div,
     "#t": True,
@@ -529,12 +602,120 @@ scheme_builtins = {
     "begin": begin,
 }
 
+# the frame at the end of every parent chain, holding the builtins
+builtins_frame = Frames.__new__(Frames)
+builtins_frame.parent = None
+builtins_frame.children = scheme_builtins
+
 
 ##############
 # Evaluation #
 ##############
 
 
+def evaluate_define(tree, frame):
+    """
+    Binds a name, or a function given as (define (name params) body), in frame.
+    """
+    if isinstance(tree[1], str):
+        current_value = evaluate(tree[2], frame)
+        frame[tree[1]] = current_value
+        return current_value
+    if isinstance(tree[1], list):
+        param = tree[1][1:]
+        body = tree[2]
+        current_func = Functions(body, param, frame)
+        frame[tree[1][0]] = current_func
+        return current_func
+    raise SchemeSyntaxError
+
+
+def evaluate_lambda(tree, frame):
+    """
+    Returns a function closing over frame.
+    """
+    param = tree[1]
+    body = tree[2]
+    return Functions(body, param, frame)
+
+
+def evaluate_if(tree, frame):
+    """
+    Returns the branch picked by the condition, and the frame to evaluate it in.
+    """
+    if evaluate(tree[1], frame):
+        return tree[2], frame
+    return tree[3], frame
+
+
+def evaluate_and(tree, frame):
+    """
+    Returns False at the first false argument, True otherwise.
+    """
+    for item in tree[1:]:
+        if not evaluate(item, frame):
+            return False
+    return True
+
+
+def evaluate_or(tree, frame):
+    """
+    Returns True at the first true argument, False otherwise.
+    """
+    for item in tree[1:]:
+        if evaluate(item, frame):
+            return True
+    return False
+
+
+def evaluate_del(tree, frame):
+    """
+    Removes a name bound directly in frame and returns its value.
+    """
+    if tree[1] not in frame.children:
+        raise SchemeNameError
+    return frame.children.pop(tree[1])
+
+
+def evaluate_let(tree, frame):
+    """
+    Returns the body, and a new frame holding the given bindings to evaluate
+    it in.
+    """
+    new_frame = Frames(frame)
+    for exp in tree[1]:
+        current_value = evaluate(exp[1], new_frame)
+        new_frame[exp[0]] = current_value
+    return tree[2], new_frame
+
+
+def evaluate_set(tree, frame):
+    """
+    Rebinds a name in the nearest frame that already has it.
+    """
+    current_value = evaluate(tree[2], frame)
+    frame.set_parent(tree[1], current_value)
+    return current_value
+
+
+# special forms don't evaluate all of their arguments up front, so evaluate
+# hands the whole tree to one of these instead of calling a function
+special_forms = {
+    "define": evaluate_define,
+    "lambda": evaluate_lambda,
+    "if": evaluate_if,
+    "and": evaluate_and,
+    "or": evaluate_or,
+    "del": evaluate_del,
+    "let": evaluate_let,
+    "set!": evaluate_set,
+}
+
+# these end by evaluating one more expression, so they hand it back to evaluate
+# to run in its loop instead of in a nested call
+tail_forms = {evaluate_if, evaluate_let}
+
+
 def evaluate(tree, frame=None):
     """
     Evaluate the given syntax tree according to the rules of the Scheme
@@ -550,64 +731,56 @@ def evaluate(tree, frame=None):
     >>> evaluate(['+', 3, ['-', 7, 5]])
     5
     """
-    if not frame:
+    if frame is None:
         frame = Frames()
-    if tree == "nil":
-        return None
-    if isinstance(tree, str):
-        return frame[tree]
-    if isinstance(tree, (int, float)):
-        return tree
-    if isinstance(tree, list) and len(tree) > 0:
-        if tree[0] == "define":
-            if isinstance(tree[1], str):
-                current_value = evaluate(tree[2], frame)
-                frame[tree[1]] = current_value
-                return current_value
-            if isinstance(tree[1], list):
-                param = tree[1][1:]
-                body = tree[2]
-                current_func = Functions(body, param, frame)
-                frame[tree[1][0]] = current_func
-                return current_func
-            raise SchemeSyntaxError
-        if tree[0] == "lambda":
-            param = tree[1]
-            body = tree[2]
-            return Functions(body, param, frame)
-        if tree[0] == "if":
-            if evaluate(tree[1], frame):
-                return evaluate(tree[2], frame)
-            return evaluate(tree[3], frame)
-        if tree[0] == "and":
-            for item in tree[1:]:
-                if not evaluate(item, frame):
-                    return False
-            return True
-        if tree[0] == "or":
-            for item in tree[1:]:
-                if evaluate(item, frame):
-                    return True
-            return False
-        if tree[0] == "del":
-            if tree[1] not in frame.children:
-                raise SchemeNameError
-            return frame.children.pop(tree[1])
-        if tree[0] == "let":
-            new_frame = Frames(frame)
-            for exp in tree[1]:
-                current_value = evaluate(exp[1], new_frame)
-                new_frame[exp[0]] = current_value
-            return evaluate(tree[2], new_frame)
-        if tree[0] == "set!":
-            current_value = evaluate(tree[2], frame)
-            frame.set_parent(tree[1], current_value)
-            return current_value
+    # expressions in tail position replace tree and frame and go around the
+    # loop again, so tail calls don't use up the Python stack
+    while True:
+        # exact type checks first, since names and numbers are most of the tree
+        tree_type = type(tree)
+        if tree_type is str:
+            if tree == "nil":
+                return None
+            return frame[tree]
+        if tree_type is int or tree_type is float:
+            return tree
+        if tree_type is not list:
+            # subclasses, such as bool, take the slower checks
+            if tree == "nil":
+                return None
+            if isinstance(tree, str):
+                return frame[tree]
+            if isinstance(tree, (int, float)):
+                return tree
+        if not isinstance(tree, list) or len(tree) == 0:
+            raise SchemeEvaluationError
+        # lists can't be dict keys, so only look up names
+        if isinstance(tree[0], str):
+            special_form = special_forms.get(tree[0])
+            if special_form is not None:
+                if special_form not in tail_forms:
+                    return special_form(tree, frame)
+                tree, frame = special_form(tree, frame)
+                continue
         maybe_func = evaluate(tree[0], frame)
         if not callable(maybe_func):
             raise SchemeEvaluationError("first element is not a valid function")
-        return maybe_func([evaluate(subtree, frame) for subtree in tree[1:]])
-    raise SchemeEvaluationError
+        if type(maybe_func) is Functions and len(tree) - 1 == len(maybe_func.param):
+            # bind each argument as it is evaluated, with no list in between
+            new_frame = Frames(maybe_func.frame)
+            new_frame.children = {
+                name: evaluate(subtree, frame)
+                for name, subtree in zip(maybe_func.param, tree[1:])
+            }
+            frame = new_frame
+            tree = maybe_func.body
+            continue
+        args = [evaluate(subtree, frame) for subtree in tree[1:]]
+        if type(maybe_func) is not Functions:
+            return maybe_func(args)
+        # the wrong number of arguments, which call_frame raises on
+        frame = maybe_func.call_frame(args)
+        tree = maybe_func.body
 
 
 def result_and_frame(tree, frame=None):
@@ -615,19 +788,32 @@ def result_and_frame(tree, frame=None):
     Given a tree, returns a tuple with two elements: the result of the
     evaluation and the frame in which the expression was evaluated.
     """
-    if not frame:
+    if frame is None:
         frame = Frames()
     return evaluate(tree, frame), frame
 
 
+# parsed trees of files already evaluated, keyed on file name, along with the
+# modification time and size they were parsed at
+_parsed_file_cache = {}
+
+
 def evaluate_file(file_name, frame=None):
     """
     Given a file name and an optional variable, frame, returns the evaluated
     expression contained in the file.
     """
+    status = os.stat(file_name)
+    version = (status.st_mtime_ns, status.st_size)
+    cached = _parsed_file_cache.get(file_name)
+    if cached is not None and cached[0] == version:
+        return evaluate(cached[1], frame)
+
     with open(file_name) as f:
         current_file = f.read()
-    return evaluate(parse(tokenize(current_file)), frame)
+    tree = parse(tokenize(current_file))
+    _parsed_file_cache[file_name] = (version, tree)
+    return evaluate(tree, frame)
 
 
 def repl(verbose=False):
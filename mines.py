@@ -2,6 +2,8 @@
 
 import typing
 import doctest
+import itertools
+from collections import Counter, deque
 
 
 
@@ -302,14 +304,8 @@ def render_2d_board(game, xray=False):
     #         return_string = return_string + '\n'
     # return return_string
 
-    locations_list = render_nd(game, xray)
-    return_string = ""
-    for x in range(game["dimensions"][0]):
-        new_string = "".join(locations_list[x])
-        return_string += new_string
-        if x != game["dimensions"][0] - 1:
-            return_string += "\n"
-    return return_string
+    # a single join puts the newlines between rows, with none at the end
+    return "\n".join("".join(row) for row in render_nd(game, xray))
 
 
 # N-D IMPLEMENTATION
@@ -344,13 +340,17 @@ def new_game_nd(dimensions, bombs):
     """
     board = empty_board(dimensions, 0)
     hidden = empty_board(dimensions, True)
-    # bombs = set(bombs)
+    # count every square's bombs at once, then write each count a single time
+    bomb_counts = Counter(
+        itertools.chain.from_iterable(
+            get_neighbors(coord, dimensions) for coord in bombs
+        )
+    )
     for coord in bombs:
         set_value(coord, board, ".")
-        for neighbor in get_neighbors(coord, dimensions):
-            curr_val = get_value(neighbor, board)
-            if isinstance(curr_val, int):
-                set_value(neighbor, board, curr_val + 1)
+    for neighbor, count in bomb_counts.items():
+        if get_value(neighbor, board) != ".":
+            set_value(neighbor, board, count)
 
     return {
         "dimensions": dimensions,
@@ -368,13 +368,9 @@ def empty_board(dimensions, value):
     Given the dimensioins of a board and a value, returns a board filled
     with the value given in every coordinate of the board.
     """
-    nd = len(dimensions)
-    result_board = []
-    if nd == 1:
-        return [value for x in range(dimensions[0])]
-    for x in range(dimensions[0]):
-        result_board.append(empty_board(dimensions[1:], value))
-    return result_board
+    if len(dimensions) == 1:
+        return [value] * dimensions[0]
+    return [empty_board(dimensions[1:], value) for x in range(dimensions[0])]
 
 
 def get_neighbors(coord, dimensions):
@@ -382,33 +378,11 @@ def get_neighbors(coord, dimensions):
     Given a coordinate and the dimensions of a board, returns all
     the neighbors of that given coordinate in a set of tuples.
     """
-    all_neighbors = set()
-    if len(coord) == 1:
-        for x in range(coord[0] - 1, coord[0] + 2):
-            if 0 <= x < dimensions[0]:
-                all_neighbors.add((x,))
-    else:
-        for x in range(coord[0] - 1, coord[0] + 2):
-            if 0 <= x < dimensions[0]:
-                for i in get_neighbors(coord[1:], dimensions[1:]):
-                    all_neighbors.add((x,) + i)
-    return all_neighbors
-
-
-def get_all_coords(dimensions):
-    """
-    Given the dimensions of a board, returns all possible coordinates
-    of the board in a set of tuples.
-    """
-    all_coords = set()
-    if len(dimensions) == 1:
-        for coord in range(dimensions[0]):
-            all_coords.add((coord,))
-    else:
-        for x in get_all_coords((dimensions[0],)):
-            for i in get_all_coords(dimensions[1:]):
-                all_coords.add(x + i)
-    return all_coords
+    # clip each axis to the board first, so every combination is in bounds
+    ranges = [
+        range(max(x - 1, 0), min(x + 2, size)) for x, size in zip(coord, dimensions)
+    ]
+    return set(itertools.product(*ranges))
 
 
 def get_value(coord, board):
@@ -416,9 +390,10 @@ def get_value(coord, board):
     Given a coordinate and a board, returns the current value of that
     coordinate on the board.
     """
-    if len(coord) == 1:
-        return board[coord[0]]
-    return get_value(coord[1:], board[coord[0]])
+    # step down one nested list per dimension, without slicing coord each time
+    for index in coord[:-1]:
+        board = board[index]
+    return board[coord[-1]]
 
 
 def set_value(coord, board, value):
@@ -426,17 +401,16 @@ def set_value(coord, board, value):
     Given a coordinate, a board, and a value, modifies the board to set
     the coordinate given to the value given.
     """
-    if len(coord) == 1:
-        board[coord[0]] = value
-    else:
-        set_value(coord[1:], board[coord[0]], value)
+    for index in coord[:-1]:
+        board = board[index]
+    board[coord[-1]] = value
 
 
 def dig_nd(game, coordinates, curr_state=True):
     """
-    Recursively dig up square at coords and neighboring squares.
+    Dig up square at coords and neighboring squares.
 
-    Update the hidden to reveal square at coords; then recursively reveal its
+    Update the hidden to reveal square at coords; then repeatedly reveal its
     neighbors, as long as coords does not contain and is not adjacent to a
     bomb.  Return a number indicating how many squares were revealed.  No
     action should be taken and 0 returned if the incoming state of the game
@@ -491,43 +465,66 @@ def dig_nd(game, coordinates, curr_state=True):
         [[True, True], [True, True], [True, True], [True, True]]
     state: defeat
     """
-    if not get_value(coordinates, game["hidden"]) or game["state"] != "ongoing":
+    hidden = game["hidden"]
+    board = game["board"]
+    if not get_value(coordinates, hidden) or game["state"] != "ongoing":
         return 0
 
-    set_value(coordinates, game["hidden"], False)
-    current_value = get_value(coordinates, game["board"])
+    # flood fill with a queue; squares are revealed as they are queued, so
+    # each one is queued at most once
+    set_value(coordinates, hidden, False)
     revealed = 1
-
-    if current_value == ".":
-        game["state"] = "defeat"
-        return revealed
-
-    if current_value == 0:
-        neighbors = get_neighbors(coordinates, game["dimensions"])
-        for coord in neighbors:
-            revealed += dig_nd(game, coord, False)
+    to_reveal = deque([coordinates])
+    while to_reveal:
+        coord = to_reveal.popleft()
+        current_value = get_value(coord, board)
+
+        if current_value == ".":
+            game["state"] = "defeat"
+            return revealed
+
+        if current_value == 0:
+            for neighbor in get_neighbors(coord, game["dimensions"]):
+                if get_value(neighbor, hidden):
+                    set_value(neighbor, hidden, False)
+                    revealed += 1
+                    to_reveal.append(neighbor)
 
     if curr_state:
-        if victory_check(game, get_all_coords(game["dimensions"])):
+        if victory_check(game):
             game["state"] = "victory"
 
     return revealed
 
 
-# dig_nd helper function:
+# dig_nd helper functions:
 
 
-def victory_check(game, coords):
+def innermost_rows(board, nd):
     """
-    Given a game and a list of all the coordinates, returns the current
-    state of the game, victory, defeat, or ongoing.
+    Given an nd-dimensional board, returns an iterator over its innermost
+    lists, in order, without building any coordinates.
     """
-    curr_state = False
-    for val in coords:
-        board_val = get_value(val, game["board"])
-        hid_val = get_value(val, game["hidden"])
-        if (not hid_val and board_val == ".") or (hid_val and board_val != "."):
-            return curr_state
+    rows = iter([board])
+    for x in range(nd - 1):
+        rows = itertools.chain.from_iterable(rows)
+    return rows
+
+
+def victory_check(game):
+    """
+    Given a game, returns True if every safe square and no bomb is revealed,
+    False otherwise.
+    """
+    # walk the board and hidden rows side by side, stopping at the first
+    # square that rules out victory
+    nd = len(game["dimensions"])
+    for board_row, hidden_row in zip(
+        innermost_rows(game["board"], nd), innermost_rows(game["hidden"], nd)
+    ):
+        for board_val, hid_val in zip(board_row, hidden_row):
+            if (not hid_val and board_val == ".") or (hid_val and board_val != "."):
+                return False
     return True
 
 
@@ -564,20 +561,33 @@ def render_nd(game, xray=False):
     [[['3', '.'], ['3', '3'], ['1', '1'], [' ', ' ']],
      [['.', '3'], ['3', '.'], ['1', '1'], [' ', ' ']]]
     """
-    all_coords = get_all_coords(game["dimensions"])
-    result_board = empty_board(game["dimensions"], "_")
+    hidden = None if xray else game["hidden"]
+    return render_rows(game["board"], hidden, len(game["dimensions"]))
 
-    for coord in all_coords:
-        current_pix = get_value(coord, game["board"])
-        if current_pix == 0:
-            set_value(coord, result_board, " ")
-        else:
-            set_value(coord, result_board, str(current_pix))
-        if not xray:
-            if get_value(coord, game["hidden"]):
-                set_value(coord, result_board, "_")
 
-    return result_board
+# render_nd helper function:
+
+
+def render_rows(board, hidden, nd):
+    """
+    Given an nd-dimensional board and its hidden array, returns the rendered
+    board with the same nesting, going down one level per dimension and
+    rendering each innermost row in one pass.  If hidden is None, every
+    square is shown.
+    """
+    if nd > 1:
+        if hidden is None:
+            return [render_rows(board_row, None, nd - 1) for board_row in board]
+        return [
+            render_rows(board_row, hidden_row, nd - 1)
+            for board_row, hidden_row in zip(board, hidden)
+        ]
+    if hidden is None:
+        return [" " if val == 0 else str(val) for val in board]
+    return [
+        "_" if hid_val else " " if val == 0 else str(val)
+        for val, hid_val in zip(board, hidden)
+    ]
 
 
 if __name__ == "__main__":
@@ -617,7 +627,6 @@ if __name__ == "__main__":
     #    verbose=False
     # )
     # # print(get_neighbors((1,1,1),(4,4,4)))
-    # # print(get_all_coords((2,2,2)))
     # doctest.run_docstring_examples(
     #    new_game_nd,
     #    globals(),